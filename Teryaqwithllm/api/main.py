@@ -83,6 +83,26 @@ def init_firebase():
 
 init_firebase()
 
+# -----------------------------------------------------------------------------
+# Schema upkeep for databases created before an index landed in init.sql
+# (init.sql only runs when the postgres volume is first initialised)
+# -----------------------------------------------------------------------------
+def ensure_indexes():
+    try:
+        # CONCURRENTLY can't run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_gps_dash_recorded "
+                "ON gps (dashboard_id, recorded_at DESC)"
+            ))
+            # superseded by the (dashboard_id, recorded_at) index above
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_gps_dash"))
+    except Exception as e:
+        logger.warning(f"⚠️ Index check failed: {e}")
+
+
+ensure_indexes()
+
 # -----------------------------------------------------------------------------
 # FastAPI App
 # -----------------------------------------------------------------------------
@@ -1,4 +1,6 @@
 # ml/predictor.py
+from functools import lru_cache
+
 import joblib
 import pandas as pd
 
@@ -76,3 +78,37 @@ def predict_sample(input_data: dict):
         "classes": classes,
         "features_used": all_columns,
     }
+
+
+# Delivery feature set (same keys as schemas.DeliveryFeatures)
+DELIVERY_FEATURE_KEYS = (
+    "patient_id",
+    "hospital_id",
+    "patient_gender",
+    "patient_age",
+    "risk_level",
+    "order_type_requested",
+    "priority_level_requested",
+)
+
+
+@lru_cache(maxsize=4096)
+def _predict_delivery_cached(feature_values: tuple) -> dict:
+    return predict_sample(dict(zip(DELIVERY_FEATURE_KEYS, feature_values)))
+
+
+def predict_delivery_cached(features: dict) -> dict:
+    """
+    Memoized predict_sample() for the delivery feature set.
+
+    Only DELIVERY_FEATURE_KEYS are used as the cache key (and passed to
+    the model), so identical patient/prescription inputs skip the model
+    load + inference entirely. Call clear_prediction_cache() after the
+    model is retrained.
+    """
+    key = tuple(features.get(k) for k in DELIVERY_FEATURE_KEYS)
+    return dict(_predict_delivery_cached(key))
+
+
+def clear_prediction_cache() -> None:
+    _predict_delivery_cached.cache_clear()
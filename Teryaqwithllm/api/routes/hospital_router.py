@@ -176,14 +176,20 @@ def to_patient_out(patient: models.Patient) -> schemas.PatientOut:
 # =========================================================
 
 
+_PRESCRIPTION_STATUS_CANON = {"active": "Active", "expired": "Expired", "invalid": "Invalid"}
+
+
 def _compute_prescription_status(pres, now: datetime) -> str:
     """
     Determine prescription status based on explicit status column
     or fallback to expiration_date logic.
+
+    Always returns one of "Active" / "Expired" / "Invalid" (the column
+    defaults to lowercase 'active'; unknown values count as Invalid).
     """
-    # If there is an explicit status, use it
+    # If there is an explicit status, use it (canonical casing)
     if hasattr(pres, "status") and pres.status:
-        return pres.status
+        return _PRESCRIPTION_STATUS_CANON.get(str(pres.status).strip().lower(), "Invalid")
 
     # Otherwise derive status from expiration_date
     if getattr(pres, "expiration_date", None) and pres.expiration_date < now:
@@ -1619,7 +1625,7 @@ def get_order_report(order_id: str, db: Session = Depends(get_db)):
         allowed_temp=allowed_temp,
         max_excursion=max_excursion,
         return_to_fridge=return_to_fridge,
-        delivery_details=delivery_details,
+        delivery_details=tuple(delivery_details),
     )
 
 
@@ -1,37 +1,20 @@
 # api/routes/ml_router.py
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 # ============================================
 #  🔬 ML Pipeline
 # ============================================
 from ml.trainer import train_model
-from ml.predictor import predict_sample
+from ml.predictor import predict_sample, clear_prediction_cache
 
 router = APIRouter(
     prefix="/ml",
     tags=["Machine Learning"],
 )
 
-# ============================================
-# 1) Generic ML Request (for any model)
-# ============================================
-
-
-class MLRequest(BaseModel):
-    """
-    Generic ML request wrapper.
-
-    - `data` is a free-form feature vector that will be passed
-      directly to `predict_sample(...)`.
-
-    Use this if you want full flexibility from Jupyter / scripts.
-    """
-    data: Dict[str, Any]
-
-
 @router.post("/train")
 def train_endpoint(limit: int = 50000):
     """
@@ -42,6 +25,8 @@ def train_endpoint(limit: int = 50000):
     """
     try:
         message = train_model(limit=limit)
+        # cached predictions belong to the previous model
+        clear_prediction_cache()
         return {"message": message}
     except Exception as e:
         raise HTTPException(
@@ -50,32 +35,8 @@ def train_endpoint(limit: int = 50000):
         )
 
 
-@router.post("/predict")
-def predict_endpoint(payload: MLRequest):
-    """
-    Run a generic prediction using the latest model.
-
-    Request body:
-    {
-      "data": {
-         ... free-form feature vector ...
-      }
-    }
-
-    The body is forwarded as-is to `predict_sample(payload.data)`.
-    """
-    try:
-        result = predict_sample(payload.data)
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Prediction failed: {str(e)}",
-        )
-
-
 # ============================================
-# 2) Delivery vs Pickup ML – strongly typed
+# Delivery vs Pickup ML – strongly typed
 #    (Patient → Hospital prediction)
 # ============================================
 
@@ -106,6 +67,31 @@ class DeliveryFeatures(BaseModel):
     priority_level_requested: Optional[str] = "Normal" # "High", "Normal", ...
 
 
+class MLRequest(BaseModel):
+    """
+    ML request wrapper for /ml/predict.
+
+    - `data` carries the same features as DeliveryFeatures; any column
+      the model was trained on but not sent is filled by predict_sample.
+    """
+    data: DeliveryFeatures
+
+
+class RawPrediction(BaseModel):
+    """
+    Raw dict returned by predict_sample(), typed.
+
+    Every key is optional so an empty result (model unavailable)
+    still validates.
+    """
+    delivery_type: Optional[str] = None
+    score: Optional[float] = None
+    recommendation: Optional[str] = None
+    confidence_scores: List[float] = Field(default_factory=list)
+    classes: List[str] = Field(default_factory=list)
+    features_used: List[str] = Field(default_factory=list)
+
+
 class DeliveryPredictionOut(BaseModel):
     """
     Standardized response for the delivery decision.
@@ -116,7 +102,33 @@ class DeliveryPredictionOut(BaseModel):
     """
     delivery_type: str
     score: Optional[float] = None
-    raw: Dict[str, Any]
+    raw: RawPrediction = Field(default_factory=RawPrediction)
+
+
+@router.post("/predict", response_model=RawPrediction)
+def predict_endpoint(payload: MLRequest):
+    """
+    Run a generic prediction using the latest model.
+
+    Request body:
+    {
+      "data": {
+         "patient_id": "uuid...",
+         "hospital_id": "uuid...",
+         ...
+      }
+    }
+
+    `data` is validated as DeliveryFeatures before reaching predict_sample.
+    """
+    try:
+        result = predict_sample(payload.data.model_dump())
+        return result
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Prediction failed: {str(e)}",
+        )
 
 
 @router.post("/predict/delivery", response_model=DeliveryPredictionOut)
@@ -10,39 +10,50 @@
 # ============================================================
 
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 import requests
+import numpy as np
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, NamedTuple, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, text
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy import desc, select, text
 
-from database import get_db
+from database import SessionLocal, get_db
 import models
 import schemas
-from ml.predictor import predict_sample
+from ml.predictor import predict_delivery_cached
 
 router = APIRouter(prefix="/patient", tags=["patient"])
 
 
+def _hm_from_seconds(total_seconds: int) -> Tuple[int, int]:
+    """Split whole seconds into (hours, minutes) with integer math only."""
+    h, rem = divmod(total_seconds, 3600)
+    return h, rem // 60
+
+
 def _format_hm(td) -> str:
     if not td:
         return "-"
     try:
-        total = int(td.total_seconds())
-        h = total // 3600
-        m = (total % 3600) // 60
+        h, m = _hm_from_seconds(int(td.total_seconds()))
         return f"{h}h {m}m"
     except Exception:
         return "-"
 
-@router.get("/{national_id}/reports/{order_id}")
+@router.get("/{national_id}/reports/{order_id}", response_class=ORJSONResponse)
 def get_patient_delivery_report(national_id: str, order_id: str, db: Session = Depends(get_db)):
     # 1) patient
-    patient = db.query(models.Patient).filter(models.Patient.national_id == national_id).first()
+    patient = _patient_by_nid(db, national_id, "name", "phone_number")
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
@@ -203,6 +214,13 @@ def _safe_col(model, *names: str):
     return None
 
 
+def _eager(loader, model, *rel_names: str) -> List[Any]:
+    """Eager-load options (joinedload/selectinload) for automap relationships that exist."""
+    if model is None:
+        return []
+    return [loader(getattr(model, n)) for n in rel_names if hasattr(model, n)]
+
+
 def _safe_in_filter(q, model, col_name: str, values: Tuple[str, ...]):
     """Apply `col.in_(values)` only if the column exists."""
     if model is None or not hasattr(model, col_name):
@@ -214,16 +232,31 @@ def _safe_in_filter(q, model, col_name: str, values: Tuple[str, ...]):
         return q
 
 
+# canonical / hyphenless / braced / urn forms that UUID() itself accepts
+_UUID_RE = re.compile(
+    r"^(?:urn:uuid:)?\{?[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\}?$",
+    re.I,
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_uuid_str(raw: str) -> Optional[UUID]:
+    # regex pre-check: non-UUID ids fail fast without raising
+    if not _UUID_RE.match(raw):
+        return None
+    try:
+        return UUID(raw)
+    except ValueError:
+        return None
+
+
 def _coerce_uuid_maybe(value: Any) -> Optional[UUID]:
     """Best-effort UUID parsing. Returns UUID if parseable, else None."""
     if value is None:
         return None
     if isinstance(value, UUID):
         return value
-    try:
-        return UUID(str(value))
-    except Exception:
-        return None
+    return _parse_uuid_str(str(value))
 
 
 # ============================================================
@@ -251,6 +284,39 @@ EstimatedDeliveryModel = _model("Estimated_Delivery_Time", "estimated_delivery_t
 EstimatedStabilityModel = _model("Estimated_Stability_Time", "estimated_stability_time", "EstimatedStabilityTime")
 
 
+# ============================================================
+# Column descriptors resolved ONCE at import (hot-path filters)
+# ============================================================
+_PATIENT_NID_COL = _safe_col(PatientModel, "national_id")
+_PRESC_ID_COL = _safe_col(PrescriptionModel, "prescription_id")
+_ORDER_ID_COL = _safe_col(OrderModel, "order_id")
+_ORDER_PATIENT_COL = _safe_col(OrderModel, "patient_id")
+_PATIENT_ID_COL = _safe_col(PatientModel, "patient_id")
+_PATIENT_HOSP_COL = _safe_col(PatientModel, "hospital_id")
+_PRESC_PATIENT_COL = _safe_col(PrescriptionModel, "patient_id")
+_PRESC_HOSP_COL = _safe_col(PrescriptionModel, "hospital_id")
+_PRESC_MED_COL = _safe_col(PrescriptionModel, "medication_id")
+_MED_ID_COL = _safe_col(MedicationModel, "medication_id")
+_MED_NAME_COL = _safe_col(MedicationModel, "name")
+_ORDER_COLS = frozenset(c.key for c in OrderModel.__table__.columns) if OrderModel is not None else frozenset()
+
+
+# ============================================================
+# Patient fetch by national_id, loading only what the endpoint reads
+# - names missing from the automapped model are skipped
+# - anything not listed is deferred: reading it later costs a query
+# ============================================================
+_PATIENT_LATLON_FIELDS = ("lat", "lon", "latitude", "longitude")
+
+
+def _patient_by_nid(db: Session, national_id: str, *fields: str):
+    q = db.query(PatientModel)
+    cols = [getattr(PatientModel, f) for f in fields if hasattr(PatientModel, f)]
+    if cols:
+        q = q.options(load_only(*cols))
+    return q.filter(_PATIENT_NID_COL == national_id).first()
+
+
 # ============================================================
 # Local input model for address update
 # ============================================================
@@ -261,6 +327,59 @@ class PatientAddressUpdateIn(BaseModel):
     lon: Optional[float] = None
 
 
+# ============================================================
+# In-process TTL cache (per worker, no external service needed)
+# ============================================================
+class _TTLCache:
+    """
+    Small insertion-ordered cache with per-entry expiry; when full, the
+    oldest entries are evicted first.
+    Each uvicorn worker keeps its own copy, so only cache data
+    where a few minutes of staleness is acceptable.
+    """
+
+    def __init__(self, ttl_seconds: float, max_items: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return value
+
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._data.pop(key, None)
+            while len(self._data) >= self.max_items:
+                self._data.popitem(last=False)
+            self._data[key] = (now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds), value)
+
+    def delete_where(self, predicate) -> None:
+        with self._lock:
+            for k in [k for k in self._data if predicate(k)]:
+                self._data.pop(k, None)
+
+
+# order-review payloads keyed on (national_id, prescription_id). Patient-side
+# writes (address change, order creation) clear the patient's entries in this
+# worker, but hospital-side prescription edits can't reach it, so the TTL is
+# kept to a few seconds: it only absorbs bursts of repeated review requests.
+_ORDER_REVIEW_CACHE = _TTLCache(ttl_seconds=float(os.getenv("ORDER_REVIEW_CACHE_TTL", "5")))
+
+# events this worker logged recently, keyed on (order_id, event_status, dedupe needle);
+# an entry lives exactly as long as its dedupe window, so a hit means "still a duplicate"
+_RECENT_EVENT_CACHE = _TTLCache(ttl_seconds=300.0)
+
+
 # ============================================================
 # Helpers
 # ============================================================
@@ -278,11 +397,7 @@ def format_interval_hm(value: Optional[timedelta]) -> Optional[str]:
         return None
     if not isinstance(value, timedelta):
         return str(value)
-    total = int(value.total_seconds())
-    if total < 0:
-        total = 0
-    h = total // 3600
-    m = (total % 3600) // 60
+    h, m = _hm_from_seconds(max(int(value.total_seconds()), 0))
     if h <= 0:
         return f"{m}m"
     return f"{h}h {m}m"
@@ -313,10 +428,9 @@ def _is_active_status(canonical_status: str) -> bool:
     return canonical_status in ("pending", "accepted", "on_delivery", "on_route")
 
 
-def _fmt_dt(dt_val: Optional[datetime]) -> Optional[str]:
-    if isinstance(dt_val, datetime):
-        return dt_val.strftime("%d %b %Y, %I:%M %p")
-    return None
+# shared with the report schema's date serializer
+_fmt_date = schemas.format_report_date
+_fmt_dt = schemas.format_report_datetime
 
 
 def _get_lat_lon(obj) -> Tuple[Optional[float], Optional[float]]:
@@ -418,12 +532,10 @@ def _resolve_med_name_for_order(db: Session, order: Any) -> Optional[str]:
 
     presc = None
     try:
-        # try uuid
+        # prescription_id is a uuid column: a non-UUID value can never match
         presc_uuid = _coerce_uuid_maybe(presc_id)
-        if presc_uuid is not None and hasattr(PrescriptionModel, "prescription_id"):
-            presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_uuid).first()
-        if presc is None and hasattr(PrescriptionModel, "prescription_id"):
-            presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_id).first()
+        if presc_uuid is not None and _PRESC_ID_COL is not None:
+            presc = db.query(PrescriptionModel).filter(_PRESC_ID_COL == presc_uuid).first()
     except Exception:
         presc = None
 
@@ -433,13 +545,13 @@ def _resolve_med_name_for_order(db: Session, order: Any) -> Optional[str]:
     return _resolve_med_name_for_prescription(db, presc)
 
 
-def _pick_best_order_for_dashboard(db: Session, patient_id) -> Optional[Any]:
+def _pick_best_order_for_dashboard(db: Session, patient_id, *options) -> Optional[Any]:
     if OrderModel is None:
         return None
 
     created_col = _safe_col(OrderModel, "created_at", "createdAt", "created_time")
 
-    q = db.query(OrderModel).filter(getattr(OrderModel, "patient_id") == patient_id)
+    q = db.query(OrderModel).options(*options).filter(_ORDER_PATIENT_COL == patient_id)
     if created_col is not None:
         q = q.order_by(desc(created_col))
 
@@ -616,8 +728,12 @@ def _log_delivery_event(
     if DeliveryEventModel is None:
         return
 
-    # optional dedupe
+    # optional dedupe (in-process hit first; DB covers other workers / restarts)
+    dedupe_key = None
     if dedupe_contains:
+        dedupe_key = (str(order_id), event_status, dedupe_contains.strip().lower())
+        if _RECENT_EVENT_CACHE.get(dedupe_key) is not None:
+            return
         if _recent_same_event_exists(db, order_id, event_status, dedupe_contains, within_minutes=dedupe_minutes):
             return
 
@@ -663,6 +779,9 @@ def _log_delivery_event(
 
         db.commit()
 
+        if dedupe_key is not None:
+            _RECENT_EVENT_CACHE.set(dedupe_key, True, ttl_seconds=dedupe_minutes * 60)
+
     except Exception:
         db.rollback()
 
@@ -740,12 +859,22 @@ def get_latest_temperature(dashboard_id: Optional[Any], db: Session) -> Optional
 # ============================================================
 # Privacy-safe route: ONLY driver -> this patient
 # ============================================================
+# Driver moves a few meters between polls: key on ~110m driver cells
+# (3 decimals) but the patient's exact point (never share another patient's route).
+_OSRM_ROUTE_CACHE = _TTLCache(ttl_seconds=float(os.getenv("OSRM_ROUTE_CACHE_TTL", "30")))
+
+
 def build_osrm_route(driver_lat: float, driver_lon: float, patient_lat: float, patient_lon: float) -> Optional[Dict[str, Any]]:
     base = os.getenv("OSRM_BASE_URL") or os.getenv("OSRM_URL")
     if not base:
         return None
 
     base = base.rstrip("/")
+    cache_key = (base, round(driver_lat, 3), round(driver_lon, 3), round(patient_lat, 6), round(patient_lon, 6))
+    cached = _OSRM_ROUTE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     url = (
         f"{base}/route/v1/driving/"
         f"{driver_lon},{driver_lat};{patient_lon},{patient_lat}"
@@ -767,7 +896,9 @@ def build_osrm_route(driver_lat: float, driver_lon: float, patient_lat: float, p
             return None
 
         coords = [{"lat": float(lat), "lon": float(lon)} for lon, lat in geom]
-        return {"distance_m": r0.get("distance"), "duration_s": r0.get("duration"), "coordinates": coords}
+        route = {"distance_m": r0.get("distance"), "duration_s": r0.get("duration"), "coordinates": coords}
+        _OSRM_ROUTE_CACHE.set(cache_key, route)
+        return route
     except Exception:
         return None
 
@@ -780,7 +911,7 @@ def lookup_patient_id(national_id: str, db: Session = Depends(get_db)):
     if PatientModel is None:
         raise HTTPException(500, "Patient model not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "name")
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
@@ -795,7 +926,7 @@ def get_patient_profile(national_id: str, db: Session = Depends(get_db)):
     if PatientModel is None:
         raise HTTPException(500, "Patient model not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = db.query(PatientModel).filter(_PATIENT_NID_COL == national_id).first()
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -829,7 +960,7 @@ def update_patient_address(national_id: str, payload: PatientAddressUpdateIn, db
     if PatientModel is None:
         raise HTTPException(500, "Patient model not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = db.query(PatientModel).filter(_PATIENT_NID_COL == national_id).first()
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -843,18 +974,27 @@ def update_patient_address(national_id: str, payload: PatientAddressUpdateIn, db
 
     db.commit()
     db.refresh(patient)
+    # the cached order review embeds the delivery address
+    _ORDER_REVIEW_CACHE.delete_where(lambda k: k[0] == national_id)
     return {"detail": "Address updated successfully"}
 
 
 # ============================================================
 #  GET /patient/home/{national_id}
 # ============================================================
-@router.get("/home/{national_id}", response_model=schemas.PatientHomeSummary)
+# polled by the home screen: unset/empty fields are left out of the payload
+# (the app already treats a missing key like null / an empty list)
+@router.get(
+    "/home/{national_id}",
+    response_model=schemas.PatientHomeSummary,
+    response_model_exclude_none=True,
+    response_model_exclude_defaults=True,
+)
 def get_patient_home_summary(national_id: str, db: Session = Depends(get_db)):
     if PatientModel is None or OrderModel is None or PrescriptionModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "name")
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -911,8 +1051,8 @@ def get_patient_home_summary(national_id: str, db: Session = Depends(get_db)):
     if NotificationModel is not None and hasattr(NotificationModel, "order_id") and hasattr(NotificationModel, "notification_time"):
         nq = (
             db.query(NotificationModel, OrderModel)
-            .join(OrderModel, getattr(NotificationModel, "order_id") == getattr(OrderModel, "order_id"))
-            .filter(getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"))
+            .join(OrderModel, getattr(NotificationModel, "order_id") == _ORDER_ID_COL)
+            .filter(_ORDER_PATIENT_COL == getattr(patient, "patient_id"))
             .order_by(desc(getattr(NotificationModel, "notification_time")))
         )
 
@@ -926,20 +1066,25 @@ def get_patient_home_summary(national_id: str, db: Session = Depends(get_db)):
     return schemas.PatientHomeSummary(
         patient_name=getattr(patient, "name", "Patient"),
         next_refill=next_refill,
-        notifications=notifications,
-        recent_orders=recent_orders,
+        notifications=tuple(notifications),
+        recent_orders=tuple(recent_orders),
     )
 
 
 # ============================================================
 #  GET /patient/{national_id}/dashboard-map
 # ============================================================
-@router.get("/{national_id}/dashboard-map", response_model=schemas.PatientDashboardMapOut)
+@router.get(
+    "/{national_id}/dashboard-map",
+    response_model=schemas.PatientDashboardMapOut,
+    response_model_exclude_none=True,
+    response_model_exclude_defaults=True,
+)
 def get_patient_dashboard_map(national_id: str, order_id: Optional[str] = None, db: Session = Depends(get_db)):
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, *_PATIENT_LATLON_FIELDS)
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -953,8 +1098,8 @@ def get_patient_dashboard_map(national_id: str, order_id: Optional[str] = None,
         active_order = (
             db.query(OrderModel)
             .filter(
-                getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"),
-                getattr(OrderModel, "order_id") == order_uuid,
+                _ORDER_PATIENT_COL == getattr(patient, "patient_id"),
+                _ORDER_ID_COL == order_uuid,
             )
             .first()
         )
@@ -974,7 +1119,7 @@ def get_patient_dashboard_map(national_id: str, order_id: Optional[str] = None,
             temperature=None,
             arrival_time=None,
             remaining_stability=None,
-            notifications=[],
+            notifications=(),
             driver_name=None,
             driver_phone=None,
             events=[],
@@ -1030,7 +1175,7 @@ def get_patient_dashboard_map(national_id: str, order_id: Optional[str] = None,
         temperature=temperature,
         arrival_time=arrival_time,
         remaining_stability=remaining_stability,
-        notifications=notifications,
+        notifications=tuple(notifications),
         driver_name=driver_name,
         driver_phone=driver_phone,
         events=events,
@@ -1045,7 +1190,7 @@ def get_patient_notifications(national_id: str, order_id: Optional[str] = None,
     if PatientModel is None or OrderModel is None or NotificationModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "patient_id")
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -1059,8 +1204,8 @@ def get_patient_notifications(national_id: str, order_id: Optional[str] = None,
 
     q = (
         db.query(NotificationModel, OrderModel)
-        .join(OrderModel, getattr(NotificationModel, "order_id") == getattr(OrderModel, "order_id"))
-        .filter(getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"))
+        .join(OrderModel, getattr(NotificationModel, "order_id") == _ORDER_ID_COL)
+        .filter(_ORDER_PATIENT_COL == getattr(patient, "patient_id"))
     )
     if order_uuid is not None:
         q = q.filter(getattr(NotificationModel, "order_id") == order_uuid)
@@ -1105,12 +1250,12 @@ def get_patient_orders(national_id: str, db: Session = Depends(get_db)):
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "patient_id")
     if not patient:
         return []
 
     created_col = _safe_col(OrderModel, "created_at", "createdAt", "created_time")
-    q = db.query(OrderModel).filter(getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"))
+    q = db.query(OrderModel).filter(_ORDER_PATIENT_COL == getattr(patient, "patient_id"))
     if created_col is not None:
         q = q.order_by(desc(created_col))
 
@@ -1152,7 +1297,7 @@ def cancel_and_delete_patient_order(national_id: str, order_id: str, db: Session
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "patient_id")
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -1163,8 +1308,8 @@ def cancel_and_delete_patient_order(national_id: str, order_id: str, db: Session
     order = (
         db.query(OrderModel)
         .filter(
-            getattr(OrderModel, "order_id") == order_uuid,
-            getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"),
+            _ORDER_ID_COL == order_uuid,
+            _ORDER_PATIENT_COL == getattr(patient, "patient_id"),
         )
         .first()
     )
@@ -1206,7 +1351,7 @@ def get_patient_prescriptions(national_id: str, db: Session = Depends(get_db)):
     if PatientModel is None or PrescriptionModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "patient_id")
     if not patient:
         return []
 
@@ -1263,17 +1408,30 @@ def get_patient_order_review(national_id: str, prescription_id: str, db: Session
     if PatientModel is None or PrescriptionModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
-    if not patient:
-        raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
+    cache_key = (national_id, prescription_id)
+    cached = _ORDER_REVIEW_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # --- fetch prescription (uuid-safe) ---
+    # --- fetch prescription + medication/hospital/patient in ONE round-trip ---
+    # (uuid column: a non-UUID id skips the query and ends in the 404 below)
+    presc_opts = _eager(joinedload, PrescriptionModel, "medication", "hospital", "patient")
     presc_uuid = _coerce_uuid_maybe(prescription_id)
     presc = None
-    if presc_uuid is not None and hasattr(PrescriptionModel, "prescription_id"):
-        presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_uuid).first()
-    if presc is None and hasattr(PrescriptionModel, "prescription_id"):
-        presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == prescription_id).first()
+    if presc_uuid is not None and _PRESC_ID_COL is not None:
+        presc = (
+            db.query(PrescriptionModel)
+            .options(*presc_opts)
+            .filter(_PRESC_ID_COL == presc_uuid)
+            .first()
+        )
+
+    # patient comes from the loaded graph; only query it when that can't answer (error paths)
+    patient = getattr(presc, "patient", None) if presc is not None else None
+    if patient is None or getattr(patient, "national_id", None) != national_id:
+        patient = db.query(PatientModel).filter(_PATIENT_NID_COL == national_id).first()
+        if not patient:
+            raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
     if not presc:
         raise HTTPException(status_code=404, detail=f"Prescription {prescription_id} not found")
@@ -1282,16 +1440,11 @@ def get_patient_order_review(national_id: str, prescription_id: str, db: Session
     if str(getattr(presc, "patient_id", "")) != str(getattr(patient, "patient_id", "")):
         raise HTTPException(status_code=403, detail="Prescription does not belong to this patient")
 
-    # --- resolve medication + risk_level from schema ---
+    # --- resolve medication + risk_level from the loaded relationship ---
     med_name = _resolve_med_name_for_prescription(db, presc) or "Unknown Medication"
 
-    risk_level = None
-    if MedicationModel is not None:
-        med_id = getattr(presc, "medication_id", None)
-        if med_id is not None and hasattr(MedicationModel, "medication_id"):
-            med = db.query(MedicationModel).filter(getattr(MedicationModel, "medication_id") == med_id).first()
-            if med:
-                risk_level = getattr(med, "risk_level", None)
+    med = getattr(presc, "medication", None)
+    risk_level = getattr(med, "risk_level", None) if med is not None else None
 
     # --- age must be int (avoid predictor crash) ---
     age = _compute_age(getattr(patient, "birth_date", None))
@@ -1319,7 +1472,7 @@ def get_patient_order_review(national_id: str, prescription_id: str, db: Session
 
     # --- call predictor safely ---
     try:
-        ml_raw = predict_sample(features) or {}
+        ml_raw = predict_delivery_cached(features) or {}
     except Exception:
         ml_raw = {}
 
@@ -1332,10 +1485,11 @@ def get_patient_order_review(national_id: str, prescription_id: str, db: Session
 
     # Optional: real hospital name (instead of "Hospital")
     hospital_name = "Hospital"
-    if HospitalModel is not None and hosp_id and hasattr(HospitalModel, "hospital_id"):
+    hosp = getattr(presc, "hospital", None) if getattr(presc, "hospital_id", None) else None
+    if hosp is None and HospitalModel is not None and hosp_id and hasattr(HospitalModel, "hospital_id"):
         hosp = db.query(HospitalModel).filter(getattr(HospitalModel, "hospital_id") == hosp_id).first()
-        if hosp and getattr(hosp, "name", None):
-            hospital_name = getattr(hosp, "name")
+    if hosp and getattr(hosp, "name", None):
+        hospital_name = getattr(hosp, "name")
 
     prescription_out = schemas.PatientOrderReviewPrescription(
         prescription_id=str(getattr(presc, "prescription_id")),
@@ -1351,7 +1505,9 @@ def get_patient_order_review(national_id: str, prescription_id: str, db: Session
     location_out = schemas.PatientOrderReviewLocation(label="Home", address=address)
     ml_out = schemas.DeliveryPredictionOut(delivery_type=delivery_type, score=score, raw=ml_raw)
 
-    return schemas.PatientOrderReviewOut(prescription=prescription_out, location=location_out, ml=ml_out)
+    review = schemas.PatientOrderReviewOut(prescription=prescription_out, location=location_out, ml=ml_out)
+    _ORDER_REVIEW_CACHE.set(cache_key, review)
+    return review
 
 # ============================================================
 #  POST /patient/{national_id}/orders
@@ -1361,30 +1517,48 @@ def create_patient_order(national_id: str, payload: schemas.PatientOrderCreateIn
     if PatientModel is None or OrderModel is None or PrescriptionModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
-    if not patient:
+    # only the ids are needed here: Core selects, no ORM row hydration
+    patient_row = db.execute(
+        select(*[c for c in (_PATIENT_ID_COL, _PATIENT_HOSP_COL) if c is not None])
+        .where(_PATIENT_NID_COL == national_id)
+    ).first()
+    if not patient_row:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
-
+    patient = patient_row._mapping
+
+    # prescription ids + owner + medication name in one statement
+    presc_cols = [c for c in (_PRESC_ID_COL, _PRESC_PATIENT_COL, _PRESC_HOSP_COL) if c is not None]
+    join_med = _PRESC_MED_COL is not None and _MED_ID_COL is not None and _MED_NAME_COL is not None
+    if join_med:
+        presc_cols.append(_MED_NAME_COL.label("med_name"))
+    presc_stmt = select(*presc_cols).select_from(PrescriptionModel)
+    if join_med:
+        presc_stmt = presc_stmt.outerjoin(MedicationModel, _MED_ID_COL == _PRESC_MED_COL)
+
+    # uuid column: a non-UUID id cannot match, so 404 without a round-trip
     presc_uuid = _coerce_uuid_maybe(getattr(payload, "prescription_id", None))
-    presc = None
+    presc_row = None
     if presc_uuid is not None:
-        presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_uuid).first()
-    if presc is None:
-        presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == getattr(payload, "prescription_id")).first()
-    if not presc:
+        presc_row = db.execute(presc_stmt.where(_PRESC_ID_COL == presc_uuid)).first()
+    if not presc_row:
         raise HTTPException(status_code=404, detail=f"Prescription {payload.prescription_id} not found")
+    presc = presc_row._mapping
+
+    # same strict ownership rule as the order-review screen
+    if str(presc.get("patient_id", "")) != str(patient.get("patient_id", "")):
+        raise HTTPException(status_code=403, detail="Prescription does not belong to this patient")
 
     order_kwargs: Dict[str, Any] = {}
     for k, v in {
-        "patient_id": getattr(patient, "patient_id"),
-        "prescription_id": getattr(presc, "prescription_id"),
-        "hospital_id": getattr(presc, "hospital_id", None) or getattr(patient, "hospital_id", None),
+        "patient_id": patient["patient_id"],
+        "prescription_id": presc["prescription_id"],
+        "hospital_id": presc.get("hospital_id") or patient.get("hospital_id"),
         "priority_level": getattr(payload, "priority_level", None) or "Normal",
         "order_type": (getattr(payload, "order_type", None) or "delivery").lower(),
         "status": "pending",
         "notes": getattr(payload, "notes", None),
     }.items():
-        if hasattr(OrderModel, k):
+        if k in _ORDER_COLS:
             order_kwargs[k] = v
 
     order = OrderModel(**order_kwargs)
@@ -1392,6 +1566,9 @@ def create_patient_order(national_id: str, payload: schemas.PatientOrderCreateIn
     db.commit()
     db.refresh(order)
 
+    # a new order may change what the review screen should show for this patient
+    _ORDER_REVIEW_CACHE.delete_where(lambda k: k[0] == national_id)
+
     order_code_for_msg = getattr(order, "code", None) or str(getattr(order, "order_id"))
 
     _log_delivery_event(
@@ -1408,8 +1585,8 @@ def create_patient_order(national_id: str, payload: schemas.PatientOrderCreateIn
     order_id_str = str(getattr(order, "order_id"))
     code = getattr(order, "code", None) or order_id_str
 
-    # ✅ FIX: return real medication name
-    med_name = _resolve_med_name_for_prescription(db, presc) or "Unknown Medication"
+    # ✅ FIX: return real medication name (joined in with the prescription ids)
+    med_name = presc.get("med_name") or "Unknown Medication"
 
     return schemas.PatientOrderOut(
         order_id=order_id_str,
@@ -1424,12 +1601,33 @@ def create_patient_order(national_id: str, payload: schemas.PatientOrderCreateIn
 
 # ============================================================
 # GPS helper: latest gps row for THIS order only (HARDENED)
+# - gps rows hang off Order.dashboard_id (same as driver telemetry);
+#   a direct gps.order_id column is used if the schema has one
+# - before the dashboard_id fallback this always returned None against the
+#   real schema, so /track and /current-route showed the driver row's
+#   lat/lon; they now show the order's latest GPS point whenever one exists
+#   and fall back to the driver row otherwise
+# - served by idx_gps_dash_recorded (dashboard_id, recorded_at DESC):
+#   one index seek + LIMIT 1, no sort. Created in init.sql for new databases
+#   and by ensure_indexes() in main.py for existing ones
 # ============================================================
-def _get_latest_gps_point(db: Session, order_uuid: UUID):
-    if GpsModel is None or not hasattr(GpsModel, "order_id"):
+def _get_latest_gps_point(db: Session, order: Any):
+    if GpsModel is None:
         return None
 
-    q = db.query(GpsModel).filter(getattr(GpsModel, "order_id") == order_uuid)
+    if hasattr(GpsModel, "order_id"):
+        key_col = getattr(GpsModel, "order_id")
+        key_val = _coerce_uuid_maybe(getattr(order, "order_id", None))
+    elif hasattr(GpsModel, "dashboard_id"):
+        key_col = getattr(GpsModel, "dashboard_id")
+        key_val = getattr(order, "dashboard_id", None)
+    else:
+        return None
+
+    if key_val is None:
+        return None
+
+    q = db.query(GpsModel).filter(key_col == key_val)
 
     if hasattr(GpsModel, "recorded_at"):
         q = q.order_by(desc(getattr(GpsModel, "recorded_at")))
@@ -1438,22 +1636,130 @@ def _get_latest_gps_point(db: Session, order_uuid: UUID):
     elif hasattr(GpsModel, "gps_time"):
         q = q.order_by(desc(getattr(GpsModel, "gps_time")))
 
-    return q.first()
+    return q.limit(1).first()
 
 
 # ============================================================
-#  GET /patient/{national_id}/track
+# AUTO LOG: Temperature / Stability excursions (patient-side)
+# - Writes DeliveryEvent + Notification (via _log_delivery_event)
+# - DEDUPED to avoid spamming when patient refreshes track
+# - Runs as a background task with its OWN session (the request
+#   session is already closed by the time it executes)
 # ============================================================
-@router.get("/{national_id}/track")
-def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Session = Depends(get_db)):
+def _temp_band_mask(temps, lo: float, hi: float) -> np.ndarray:
+    """
+    Vectorized band check for a batch of readings (e.g. a temperature history
+    or several polled orders): True where the reading is outside [lo, hi].
+    Single readings stay on the scalar comparison in _check_excursions.
+    """
+    arr = np.asarray(temps, dtype=np.float64)
+    return (arr < lo) | (arr > hi)
+
+
+def _check_excursions(
+    order_id,
+    min_allowed,
+    max_allowed,
+    temperature: Optional[float],
+    stability_seconds: Optional[int],
+    pl_lat: Optional[float],
+    pl_lon: Optional[float],
+) -> None:
+    # ------------- decide first; only open a session when there is something to log -------------
+    temp_excursion = None
+    if temperature is not None and min_allowed is not None and max_allowed is not None:
+        try:
+            temp_val = float(temperature)
+            lo = float(min_allowed)
+            hi = float(max_allowed)
+            if temp_val < lo or temp_val > hi:
+                temp_excursion = (temp_val, lo, hi)
+        except Exception:
+            pass
+
+    stability_over = isinstance(stability_seconds, int) and stability_seconds <= 0
+
+    if temp_excursion is None and not stability_over:
+        return
+
+    db = SessionLocal()
+    try:
+        # ------------- Temperature excursion -------------
+        if temp_excursion is not None:
+            temp_val, lo, hi = temp_excursion
+            _log_delivery_event(
+                db=db,
+                order_id=order_id,
+                event_status="temperature_exceeded",
+                event_message=f"Temperature excursion detected: {temp_val:.2f}°C (allowed {lo:.2f}–{hi:.2f}°C).",
+                condition="Danger",
+                remaining_stability=(timedelta(seconds=stability_seconds) if isinstance(stability_seconds, int) else None),
+                lat=pl_lat,
+                lon=pl_lon,
+                dedupe_contains="Temperature excursion detected",
+                dedupe_minutes=10,
+                notify=True,
+                notif_message=f"Warning: temperature is out of range ({temp_val:.1f}°C).",
+            )
+
+        # ------------- Stability excursion (remaining <= 0) -------------
+        if stability_over:
+            _log_delivery_event(
+                db=db,
+                order_id=order_id,
+                event_status="stability_exceeded",
+                event_message="Stability time exceeded: medication stability window is over.",
+                condition="Danger",
+                remaining_stability=timedelta(seconds=0),
+                lat=pl_lat,
+                lon=pl_lon,
+                dedupe_contains="Stability time exceeded",
+                dedupe_minutes=10,
+                notify=True,
+                notif_message="Warning: stability time has been exceeded.",
+            )
+
+        # ------------- Optional: Max excursion time exceeded (if you store it somewhere) -------------
+        # If you later track "time_out_of_range" in your DB, this is where you'd compare it to
+        # medication.max_time_exertion and log a "time_exceeded" event. For now, we only log
+        # temperature_exceeded + stability_exceeded.
+
+    except Exception:
+        # Never break the track endpoint because of logging
+        pass
+    finally:
+        db.close()
+
+
+# ============================================================
+# Track pipeline pieces (shared by /track, /track/{id}, /current-route)
+# ============================================================
+class _TrackContext(NamedTuple):
+    patient: Any
+    order: Any
+    driver_name: Optional[str]
+    driver_phone: Optional[str]
+    driver_lat: Optional[float]
+    driver_lon: Optional[float]
+    patient_lat: Optional[float]
+    patient_lon: Optional[float]
+
+
+def _resolve_track(national_id: str, order_id: Optional[str], db: Session) -> _TrackContext:
+    """patient + order + driver + latest gps (no telemetry, no logging)."""
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, *_PATIENT_LATLON_FIELDS)
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
     order = None
+    # driver + prescription->medication ride along with the order (IN-queries)
+    # instead of follow-up lookups; medication limits feed the excursion check
+    order_opts = _eager(selectinload, OrderModel, "driver")
+    if hasattr(OrderModel, "prescription") and PrescriptionModel is not None and hasattr(PrescriptionModel, "medication"):
+        order_opts.append(selectinload(OrderModel.prescription).selectinload(PrescriptionModel.medication))
 
     if order_id and str(order_id).strip():
         order_uuid = _coerce_uuid_maybe(order_id)
@@ -1462,9 +1768,10 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
 
         order = (
             db.query(OrderModel)
+            .options(*order_opts)
             .filter(
-                getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"),
-                getattr(OrderModel, "order_id") == order_uuid,
+                _ORDER_PATIENT_COL == getattr(patient, "patient_id"),
+                _ORDER_ID_COL == order_uuid,
             )
             .first()
         )
@@ -1472,7 +1779,7 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
             raise HTTPException(status_code=404, detail=f"Order {order_id} not found for this patient")
 
     if order is None:
-        order = _pick_best_order_for_dashboard(db, getattr(patient, "patient_id"))
+        order = _pick_best_order_for_dashboard(db, getattr(patient, "patient_id"), *order_opts)
 
     if not order:
         raise HTTPException(status_code=404, detail="No orders found for this patient")
@@ -1483,27 +1790,81 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
     driver_lon = None
 
     driver_id = getattr(order, "driver_id", None)
-    driver_obj = None
-    if driver_id is not None and DriverModel is not None and hasattr(DriverModel, "driver_id"):
+    driver_obj = getattr(order, "driver", None) if driver_id is not None else None
+    if driver_obj is None and driver_id is not None and DriverModel is not None and hasattr(DriverModel, "driver_id"):
         driver_obj = db.query(DriverModel).filter(getattr(DriverModel, "driver_id") == driver_id).first()
-        if driver_obj:
-            driver_name = getattr(driver_obj, "name", None) or getattr(driver_obj, "full_name", None)
-            driver_phone = getattr(driver_obj, "phone_number", None) or getattr(driver_obj, "mobile", None)
-            driver_lat, driver_lon = _get_lat_lon(driver_obj)
+    if driver_obj is not None:
+        driver_name = getattr(driver_obj, "name", None) or getattr(driver_obj, "full_name", None)
+        driver_phone = getattr(driver_obj, "phone_number", None) or getattr(driver_obj, "mobile", None)
+        driver_lat, driver_lon = _get_lat_lon(driver_obj)
 
     try:
-        order_uuid2 = _coerce_uuid_maybe(getattr(order, "order_id"))
-        if order_uuid2 is not None:
-            gps_row = _get_latest_gps_point(db, order_uuid2)
-            if gps_row is not None:
-                glat, glon = _get_lat_lon(gps_row)
-                if glat is not None and glon is not None:
-                    driver_lat, driver_lon = glat, glon
+        gps_row = _get_latest_gps_point(db, order)
+        if gps_row is not None:
+            glat, glon = _get_lat_lon(gps_row)
+            if glat is not None and glon is not None:
+                driver_lat, driver_lon = glat, glon
     except Exception:
         pass
 
     patient_lat, patient_lon = _get_lat_lon(patient)
 
+    return _TrackContext(
+        patient=patient,
+        order=order,
+        driver_name=driver_name,
+        driver_phone=driver_phone,
+        driver_lat=driver_lat,
+        driver_lon=driver_lon,
+        patient_lat=patient_lat,
+        patient_lon=patient_lon,
+    )
+
+
+def _build_route(ctx: _TrackContext) -> Optional[Dict[str, Any]]:
+    if ctx.driver_lat is None or ctx.driver_lon is None or ctx.patient_lat is None or ctx.patient_lon is None:
+        return None
+    return build_osrm_route(ctx.driver_lat, ctx.driver_lon, ctx.patient_lat, ctx.patient_lon)
+
+
+def _schedule_excursion_check(
+    ctx: _TrackContext,
+    temperature: Optional[float],
+    stability_seconds: Optional[int],
+    background: Optional[BackgroundTasks],
+) -> None:
+    presc = getattr(ctx.order, "prescription", None)
+    med = getattr(presc, "medication", None) if presc is not None else None
+
+    # excursion logging writes rows; keep it off the response path
+    excursion_args = (
+        getattr(ctx.order, "order_id"),
+        getattr(med, "min_temp_range_excursion", None) if med is not None else None,
+        getattr(med, "max_temp_range_excursion", None) if med is not None else None,
+        temperature,
+        stability_seconds,
+        ctx.patient_lat,
+        ctx.patient_lon,
+    )
+    if background is not None:
+        background.add_task(_check_excursions, *excursion_args)
+    else:
+        _check_excursions(*excursion_args)
+
+
+# ============================================================
+#  GET /patient/{national_id}/track
+# ============================================================
+@router.get("/{national_id}/track", response_class=ORJSONResponse)
+def get_patient_track(
+    national_id: str,
+    order_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    background: BackgroundTasks = None,
+):
+    ctx = _resolve_track(national_id, order_id, db)
+    order = ctx.order
+
     created_at = getattr(order, "created_at", None)
     delivered_at = getattr(order, "delivered_at", None)
 
@@ -1512,8 +1873,8 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
 
     eta_dt = getattr(order, "estimated_delivery_time", None)
     estimated_date_str = (
-        eta_dt.strftime("%d %b %Y") if isinstance(eta_dt, datetime)
-        else (created_at.strftime("%d %b %Y") if isinstance(created_at, datetime) else "")
+        _fmt_date(eta_dt) if isinstance(eta_dt, datetime)
+        else (_fmt_date(created_at) if isinstance(created_at, datetime) else "")
     )
 
     status_canonical = _normalize_status(getattr(order, "status", None))
@@ -1524,100 +1885,10 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
     dashboard_id = getattr(order, "dashboard_id", None)
     arrival_time, remaining_stability, eta_seconds, stability_seconds = get_dashboard_times(dashboard_id, db)
     temperature = get_latest_temperature(dashboard_id, db)
-        # ============================================================
-    # AUTO LOG: Temperature / Stability excursions (patient-side)
-    # - Writes DeliveryEvent + Notification (via _log_delivery_event)
-    # - DEDUPED to avoid spamming when patient refreshes track
-    # ============================================================
 
-    try:
-        # Fetch medication limits for this order (if available)
-        min_allowed = None
-        max_allowed = None
-        max_time_exertion_td = None  # optional (timedelta)
-
-        presc = None
-        med = None
-
-        if PrescriptionModel is not None:
-            presc_id = getattr(order, "prescription_id", None)
-            presc_uuid = _coerce_uuid_maybe(presc_id) if presc_id is not None else None
-
-            if presc_uuid is not None and hasattr(PrescriptionModel, "prescription_id"):
-                presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_uuid).first()
-            if presc is None and hasattr(PrescriptionModel, "prescription_id"):
-                presc = db.query(PrescriptionModel).filter(getattr(PrescriptionModel, "prescription_id") == presc_id).first()
-
-        if presc is not None and MedicationModel is not None:
-            med_id = getattr(presc, "medication_id", None)
-            if med_id is not None and hasattr(MedicationModel, "medication_id"):
-                med = db.query(MedicationModel).filter(getattr(MedicationModel, "medication_id") == med_id).first()
-
-        if med is not None:
-            # temperature band
-            min_allowed = getattr(med, "min_temp_range_excursion", None)
-            max_allowed = getattr(med, "max_temp_range_excursion", None)
-
-            # optional: maximum time outside safe range
-            max_time_exertion_td = getattr(med, "max_time_exertion", None)
-
-        # Latest patient/driver location for context (optional)
-        pl_lat, pl_lon = _get_lat_lon(patient)
-
-        # ------------- Temperature excursion -------------
-        if temperature is not None and min_allowed is not None and max_allowed is not None:
-            try:
-                temp_val = float(temperature)
-                lo = float(min_allowed)
-                hi = float(max_allowed)
-
-                if temp_val < lo or temp_val > hi:
-                    _log_delivery_event(
-                        db=db,
-                        order_id=getattr(order, "order_id"),
-                        event_status="temperature_exceeded",
-                        event_message=f"Temperature excursion detected: {temp_val:.2f}°C (allowed {lo:.2f}–{hi:.2f}°C).",
-                        condition="Danger",
-                        remaining_stability=(timedelta(seconds=stability_seconds) if isinstance(stability_seconds, int) else None),
-                        lat=pl_lat,
-                        lon=pl_lon,
-                        dedupe_contains="Temperature excursion detected",
-                        dedupe_minutes=10,
-                        notify=True,
-                        notif_message=f"Warning: temperature is out of range ({temp_val:.1f}°C).",
-                    )
-            except Exception:
-                pass
-
-        # ------------- Stability excursion (remaining <= 0) -------------
-        if isinstance(stability_seconds, int) and stability_seconds <= 0:
-            _log_delivery_event(
-                db=db,
-                order_id=getattr(order, "order_id"),
-                event_status="stability_exceeded",
-                event_message="Stability time exceeded: medication stability window is over.",
-                condition="Danger",
-                remaining_stability=timedelta(seconds=0),
-                lat=pl_lat,
-                lon=pl_lon,
-                dedupe_contains="Stability time exceeded",
-                dedupe_minutes=10,
-                notify=True,
-                notif_message="Warning: stability time has been exceeded.",
-            )
-
-        # ------------- Optional: Max excursion time exceeded (if you store it somewhere) -------------
-        # If you later track "time_out_of_range" in your DB, this is where you'd compare it to max_time_exertion_td
-        # and log a "time_exceeded" event. For now, we only log temperature_exceeded + stability_exceeded.
-
-    except Exception:
-        # Never break the track endpoint because of logging
-        pass
-
-    route = None
-    if driver_lat is not None and driver_lon is not None and patient_lat is not None and patient_lon is not None:
-        route = build_osrm_route(driver_lat, driver_lon, patient_lat, patient_lon)
+    _schedule_excursion_check(ctx, temperature, stability_seconds, background)
 
+    route = _build_route(ctx)
     events = _build_order_events(order)
 
     return {
@@ -1636,14 +1907,14 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
         "eta_seconds": eta_seconds,
         "stability_seconds": stability_seconds,
 
-        "patient": {"lat": patient_lat, "lon": patient_lon},
-        "driver": {"lat": driver_lat, "lon": driver_lon},
+        "patient": {"lat": ctx.patient_lat, "lon": ctx.patient_lon},
+        "driver": {"lat": ctx.driver_lat, "lon": ctx.driver_lon},
 
         "route": route,
 
         "deliveredAt": delivered_at_str or "",
-        "driverName": driver_name or "",
-        "driverPhone": driver_phone or "",
+        "driverName": ctx.driver_name or "",
+        "driverPhone": ctx.driver_phone or "",
         "priority": priority,
         "orderType": order_type,
         "createdAt": created_at_str or "",
@@ -1654,30 +1925,36 @@ def get_patient_track(national_id: str, order_id: Optional[str] = None, db: Sess
 
 # ============================================================
 #  GET /patient/{national_id}/current-route
+#  - only resolves positions + route (no telemetry, no event logging)
 # ============================================================
-@router.get("/{national_id}/current-route")
+@router.get("/{national_id}/current-route", response_class=ORJSONResponse)
 def get_patient_current_route(national_id: str, order_id: Optional[str] = None, db: Session = Depends(get_db)):
-    data = get_patient_track(national_id=national_id, order_id=order_id, db=db)
-    return {"order_id": data.get("orderId"), "driver": data.get("driver"), "patient": data.get("patient"), "route": data.get("route")}
+    ctx = _resolve_track(national_id, order_id, db)
+    return {
+        "order_id": str(getattr(ctx.order, "order_id")),
+        "driver": {"lat": ctx.driver_lat, "lon": ctx.driver_lon},
+        "patient": {"lat": ctx.patient_lat, "lon": ctx.patient_lon},
+        "route": _build_route(ctx),
+    }
 
 
 # ============================================================
 #  BONUS: GET /patient/{national_id}/track/{order_id}
 # ============================================================
-@router.get("/{national_id}/track/{order_id}")
-def get_patient_track_by_id(national_id: str, order_id: str, db: Session = Depends(get_db)):
-    return get_patient_track(national_id=national_id, order_id=order_id, db=db)
+@router.get("/{national_id}/track/{order_id}", response_class=ORJSONResponse)
+def get_patient_track_by_id(national_id: str, order_id: str, db: Session = Depends(get_db), background: BackgroundTasks = None):
+    return get_patient_track(national_id=national_id, order_id=order_id, db=db, background=background)
 
 
 # ============================================================
 #  GET /patient/{national_id}/reports/{order_id}
 # ============================================================
-@router.get("/{national_id}/reports/{order_id}", response_model=schemas.PatientOrderReportOut)
+@router.get("/{national_id}/reports/{order_id}", response_model=schemas.PatientOrderReportOut, response_class=ORJSONResponse)
 def get_patient_delivery_report(national_id: str, order_id: str, db: Session = Depends(get_db)):
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "name", "phone_number")
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -1688,8 +1965,8 @@ def get_patient_delivery_report(national_id: str, order_id: str, db: Session = D
     order = (
         db.query(OrderModel)
         .filter(
-            getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"),
-            getattr(OrderModel, "order_id") == order_uuid,
+            _ORDER_PATIENT_COL == getattr(patient, "patient_id"),
+            _ORDER_ID_COL == order_uuid,
         )
         .first()
     )
@@ -1700,10 +1977,6 @@ def get_patient_delivery_report(national_id: str, order_id: str, db: Session = D
     delivered_at = getattr(order, "delivered_at", None)
     generated_at = datetime.utcnow()
 
-    created_at_str = _fmt_dt(created_at) or ""
-    delivered_at_str = _fmt_dt(delivered_at) or ""
-    generated_str = _fmt_dt(generated_at) or ""
-
     order_code = str(getattr(order, "order_id"))
     order_type = getattr(order, "order_type", None) or "Delivery"
     order_status = _normalize_status(getattr(order, "status", None))
@@ -1717,32 +1990,31 @@ def get_patient_delivery_report(national_id: str, order_id: str, db: Session = D
 
     verified = (order_status == "delivered")
 
-    def _event_row(event_status: str, event_desc: str) -> schemas.DeliveryDetail:
-        return schemas.DeliveryDetail(status=event_status, description=event_desc, duration="-", stability="-", condition="Normal")
-
-    event_details: List[schemas.DeliveryDetail] = []
-    for e in _build_order_events(order):
-        event_details.append(_event_row(str(e.get("status", "")), str(e.get("description", ""))))
+    _DD = schemas.DeliveryDetail
+    event_details: List[schemas.DeliveryDetail] = [
+        _DD(status=str(e.get("status", "")), description=str(e.get("description", "")), duration="-", stability="-", condition="Normal")
+        for e in _build_order_events(order)
+    ]
 
     static_details: List[schemas.DeliveryDetail] = [
-        schemas.DeliveryDetail(status="Packed", description="Order packed and released by hospital.", duration="-", stability="-", condition="Normal"),
-        schemas.DeliveryDetail(status="Assigned", description="Driver assigned and picked up the order.", duration="15m", stability="7h 45m", condition="Normal"),
-        schemas.DeliveryDetail(status="Delivery", description="Order is on the way to patient.", duration="1h 30m", stability="7h 00m", condition="Normal"),
-        schemas.DeliveryDetail(status="Arrived", description="Driver arrived at patient location.", duration="2h 10m", stability="6h 50m", condition="Normal"),
-        schemas.DeliveryDetail(status="Delivered", description="OTP verified and order handed to patient.", duration="2h 15m", stability="6h 45m", condition="Normal"),
+        _DD(status="Packed", description="Order packed and released by hospital.", duration="-", stability="-", condition="Normal"),
+        _DD(status="Assigned", description="Driver assigned and picked up the order.", duration="15m", stability="7h 45m", condition="Normal"),
+        _DD(status="Delivery", description="Order is on the way to patient.", duration="1h 30m", stability="7h 00m", condition="Normal"),
+        _DD(status="Arrived", description="Driver arrived at patient location.", duration="2h 10m", stability="6h 50m", condition="Normal"),
+        _DD(status="Delivered", description="OTP verified and order handed to patient.", duration="2h 15m", stability="6h 45m", condition="Normal"),
     ]
 
-    details = event_details + static_details
+    details = (*event_details, *static_details)
 
     return schemas.PatientOrderReportOut(
         id=order_code,
         type="Delivery Report",
-        generated=generated_str,
+        generated=generated_at,
         orderID=order_code,
         orderType=order_type,
         orderStatus=order_status,
-        createdAt=created_at_str,
-        deliveredAt=delivered_at_str,
+        createdAt=created_at,
+        deliveredAt=delivered_at,
         otpCode=otp_code,
         verified=verified,
         priority="High" if str(getattr(order, "priority_level", "Normal")).lower() in ("high", "urgent") else "Normal",
@@ -1771,7 +2043,7 @@ def get_patient_order_events(national_id: str, order_id: str, db: Session = Depe
     if PatientModel is None or OrderModel is None:
         raise HTTPException(500, "Required models not available")
 
-    patient = db.query(PatientModel).filter(getattr(PatientModel, "national_id") == national_id).first()
+    patient = _patient_by_nid(db, national_id, "patient_id")
     if not patient:
         raise HTTPException(status_code=404, detail=f"Patient with national_id={national_id} not found")
 
@@ -1782,8 +2054,8 @@ def get_patient_order_events(national_id: str, order_id: str, db: Session = Depe
     order = (
         db.query(OrderModel)
         .filter(
-            getattr(OrderModel, "patient_id") == getattr(patient, "patient_id"),
-            getattr(OrderModel, "order_id") == order_uuid,
+            _ORDER_PATIENT_COL == getattr(patient, "patient_id"),
+            _ORDER_ID_COL == order_uuid,
         )
         .first()
     )
@@ -1810,17 +2082,15 @@ def _fmt_interval_hm(val) -> str:
     if val is None:
         return "-"
     try:
-        total_minutes = int(val.total_seconds() // 60)
-        h = total_minutes // 60
-        m = total_minutes % 60
+        h, m = _hm_from_seconds(int(val.total_seconds()))
         return f"{h}h {m}m" if h > 0 else f"{m}m"
     except Exception:
         return "-"
 
-@router.get("/{national_id}/reports/{order_id}")
+@router.get("/{national_id}/reports/{order_id}", response_class=ORJSONResponse)
 def get_patient_report(national_id: str, order_id: str, db: Session = Depends(get_db)):
     # 1) patient exists
-    patient = db.query(models.Patient).filter(models.Patient.national_id == national_id).first()
+    patient = _patient_by_nid(db, national_id, "name", "phone_number")
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
 
@@ -1837,22 +2107,26 @@ def get_patient_report(national_id: str, order_id: str, db: Session = Depends(ge
         med = db.query(models.Medication).filter(models.Medication.medication_id == pres.medication_id).first()
 
     # ✅ SOURCE OF TRUTH: delivery_event
-    events = (
-        db.query(models.DeliveryEvent)
-        .filter(models.DeliveryEvent.order_id == order_id)
-        .order_by(asc(models.DeliveryEvent.recorded_at))
-        .all()
+    # streamed in batches (server-side cursor) so long histories are never
+    # materialized twice; only the columns the report shows are fetched
+    DE = models.DeliveryEvent
+    events_iter = (
+        db.query(DE.event_status, DE.event_message, DE.duration, DE.remaining_stability, DE.condition)
+        .filter(DE.order_id == order_id)
+        .order_by(asc(DE.recorded_at))
+        .yield_per(200)
     )
 
-    delivery_details = []
-    for e in events:
-        delivery_details.append({
+    delivery_details = [
+        {
             "status": e.event_status or "-",
             "description": e.event_message or "-",
             "duration": _fmt_interval_hm(e.duration),
             "stability": _fmt_interval_hm(e.remaining_stability),
             "condition": e.condition or "Normal",
-        })
+        }
+        for e in events_iter
+    ]
 
     # medication fields (same as hospital report needs)
     allowed_temp = "-"
@@ -1,9 +1,39 @@
 # api/schemas.py
 
 from datetime import date, datetime
-from typing import List, Optional, Literal, Dict, Any
+from typing import List, Optional, Literal, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+# One config object shared by every *Out response model (read from ORM rows,
+# ignore extras), so identical configs are not rebuilt per class.
+_OUT_CONFIG = ConfigDict(from_attributes=True, extra="ignore")
+
+# Closed value sets validated as literals
+PrescriptionStatus = Literal["Active", "Expired", "Invalid"]
+
+
+# ============================================================
+# 🕒 REPORT DATE FORMATTING
+#   - mobile reports show "05 Jan 2025, 03:04 PM" (strftime("%d %b %Y, %I:%M %p")),
+#     built by hand to skip the locale-aware strftime path
+# ============================================================
+
+_MON = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def format_report_date(dt_val: datetime) -> str:
+    """Same output as strftime("%d %b %Y")."""
+    return f"{dt_val.day:02d} {_MON[dt_val.month - 1]} {dt_val.year}"
+
+
+def format_report_datetime(dt_val: Optional[datetime]) -> Optional[str]:
+    """Same output as strftime("%d %b %Y, %I:%M %p"); None for non-datetimes."""
+    if isinstance(dt_val, datetime):
+        hour12 = dt_val.hour % 12 or 12
+        ampm = "AM" if dt_val.hour < 12 else "PM"
+        return f"{format_report_date(dt_val)}, {hour12:02d}:{dt_val.minute:02d} {ampm}"
+    return None
 
 # ============================================================
 # 🔐 AUTH SCHEMAS (PATIENT / HOSPITAL / DRIVER)
@@ -95,6 +125,8 @@ class PatientOut(PatientBase):
     """
     Response for patient records returned to the hospital app.
     """
+    model_config = _OUT_CONFIG
+
     patient_id: str
     hospital_id: Optional[str] = None
     status: str
@@ -135,6 +167,8 @@ class MedicationOut(BaseModel):
     """
     Medication information used in dropdowns and prescription cards.
     """
+    model_config = _OUT_CONFIG
+
     medication_id: str
     name: str
 
@@ -171,19 +205,17 @@ class PrescriptionCreate(BaseModel):
     expiration_date: Optional[datetime] = None
     reorder_threshold: Optional[int] = None
 
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore")
 
 
-class PatientPrescriptionSummary(BaseModel):
+class _PrescriptionBase(BaseModel):
     """
-    Small summary used in PatientProfileScreen card list.
+    Fields shared by the prescription list cards (hospital + profile screens).
     """
-    prescription_id: str
-    medicine_name: str
-    status: str                        # "Active" / "Expired" / "Invalid"
+    model_config = _OUT_CONFIG
 
-    refill_limit_text: Optional[str] = None
+    prescription_id: str
+    status: PrescriptionStatus
 
     start_date: Optional[date] = None
     end_date: Optional[date] = None
@@ -191,6 +223,15 @@ class PatientPrescriptionSummary(BaseModel):
 
     doctor_name: Optional[str] = None
     is_valid: Optional[bool] = None
+
+
+class PatientPrescriptionSummary(_PrescriptionBase):
+    """
+    Small summary used in PatientProfileScreen card list.
+    """
+    medicine_name: str
+
+    refill_limit_text: Optional[str] = None
     gender: Optional[str] = None
 
 
@@ -198,6 +239,8 @@ class PatientProfileOut(BaseModel):
     """
     Full patient profile + list of prescriptions.
     """
+    model_config = _OUT_CONFIG
+
     patient_id: str
     national_id: str
     name: str
@@ -210,29 +253,23 @@ class PatientProfileOut(BaseModel):
     prescriptions: List[PatientPrescriptionSummary]
 
 
-class PrescriptionCardOut(BaseModel):
+class PrescriptionCardOut(_PrescriptionBase):
     """
     Card used in ManagePrescriptions screen list.
     """
-    prescription_id: str
     name: str               # medication name
     code: str               # short code from prescription_id
     patient: str            # patient name
 
     refill_limit: Optional[int] = None
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-    created_at: Optional[date] = None
-
-    doctor_name: Optional[str] = None
-    status: str             # Active / Expired / Invalid
-    is_valid: Optional[bool] = None
 
 
 class PrescriptionDetailOut(BaseModel):
     """
     Detailed view of a single prescription.
     """
+    model_config = _OUT_CONFIG
+
     prescription_id: str
     medication_name: str
     patient_name: str
@@ -247,7 +284,7 @@ class PrescriptionDetailOut(BaseModel):
     prescribing_doctor: str
     expiration_date: Optional[datetime] = None
     reorder_threshold: Optional[int] = None
-    status: str
+    status: PrescriptionStatus
     created_at: datetime
 
 
@@ -268,39 +305,40 @@ class OrderCreate(BaseModel):
     notes: Optional[str] = None
     otp: Optional[int] = None
 
-    class Config:
-        extra = "ignore"
+    model_config = ConfigDict(extra="ignore")
 
 
-class OrderSummary(BaseModel):
+class _OrderBase(BaseModel):
     """
-    Lightweight representation for hospital orders list.
+    Fields shared by the hospital order list row and the order detail view.
     """
+    model_config = _OUT_CONFIG
+
     order_id: str
     code: str
+    status: str
+    priority_level: str
+
     medicine_name: str
     patient_name: str
+
+
+class OrderSummary(_OrderBase):
+    """
+    Lightweight representation for hospital orders list.
+    """
     placed_at: date
-    status: str
-    priority_level: str
     can_generate_report: bool
 
 
-class OrderDetailOut(BaseModel):
+class OrderDetailOut(_OrderBase):
     """
     Detailed order view for hospital (OrderReviewScreen, etc.).
     """
-    order_id: str
-    code: str
-    status: str
-    priority_level: str
-
     placed_at: datetime
     delivered_at: Optional[datetime] = None
 
     # Patient / Medication / Hospital
-    medicine_name: str
-    patient_name: str
     patient_national_id: str
     hospital_name: str
 
@@ -354,6 +392,8 @@ class OrderReportOut(BaseModel):
     Full order report used by:
       - GET /hospital/orders/{order_id}/report
     """
+    model_config = _OUT_CONFIG
+
     report_id: str
     type: str
 
@@ -381,20 +421,13 @@ class OrderReportOut(BaseModel):
     max_excursion: Optional[str] = None  # e.g. "30 minutes"
     return_to_fridge: Optional[str] = None  # "Yes" / "No"
 
-    delivery_details: List[DeliveryDetail]
+    delivery_details: Tuple[DeliveryDetail, ...]
 
 
 # ============================================================
 # (OPTIONAL) ML SCHEMAS
 # ============================================================
 
-class MLRequest(BaseModel):
-    """
-    Generic ML request wrapper used by /ml/predict.
-    """
-    data: Dict[str, Any]
-
-
 class DeliveryFeatures(BaseModel):
     """
     Structured features for ML-based delivery vs pickup prediction.
@@ -410,13 +443,37 @@ class DeliveryFeatures(BaseModel):
     priority_level_requested: Optional[str] = "Normal"
 
 
+class MLRequest(BaseModel):
+    """
+    ML request wrapper used by /ml/predict.
+    """
+    data: DeliveryFeatures
+
+
+class RawPrediction(BaseModel):
+    """
+    Raw output of predict_sample(); every key is optional because
+    callers fall back to an empty result when the model is unavailable.
+    """
+    model_config = _OUT_CONFIG
+
+    delivery_type: Optional[str] = None
+    score: Optional[float] = None
+    recommendation: Optional[str] = None
+    confidence_scores: List[float] = Field(default_factory=list)
+    classes: List[str] = Field(default_factory=list)
+    features_used: List[str] = Field(default_factory=list)
+
+
 class DeliveryPredictionOut(BaseModel):
     """
     Output for ML delivery decision and PatientOrderReview screen.
     """
+    model_config = _OUT_CONFIG
+
     delivery_type: str                      # "pickup" or "delivery"
     score: Optional[float] = None
-    raw: Dict[str, Any] = Field(default_factory=dict)
+    raw: RawPrediction = Field(default_factory=RawPrediction)
 
 
 # ============================================================
@@ -428,6 +485,8 @@ class PatientAppProfileOut(BaseModel):
     """
     Basic profile for the patient mobile app.
     """
+    model_config = _OUT_CONFIG
+
     patient_id: str
     national_id: str
     name: str
@@ -476,8 +535,8 @@ class PatientHomeSummary(BaseModel):
     """
     patient_name: str
     next_refill: Optional[PatientHomeRefill] = None
-    notifications: List[PatientHomeNotification] = []
-    recent_orders: List[PatientHomeRecentOrder] = []
+    notifications: Tuple[PatientHomeNotification, ...] = ()
+    recent_orders: Tuple[PatientHomeRecentOrder, ...] = ()
 
 
 # ============================================================
@@ -493,14 +552,13 @@ class PatientNotificationOut(BaseModel):
       - "warning" → yellow
       - "danger"  → red
     """
+    model_config = _OUT_CONFIG
+
     title: str
     description: str
     level: Literal["success", "warning", "danger"] = "warning"
     notification_time: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
-
 
 # ============================================================
 # 📦 PATIENT APP – ORDERS & PRESCRIPTIONS
@@ -516,6 +574,8 @@ class PatientOrderOut(BaseModel):
     - placed_at       → order creation time
     - delivered_at    → delivery time (null if not delivered yet)
     """
+    model_config = _OUT_CONFIG
+
     status: str
     code: str
     medication_name: str
@@ -527,6 +587,8 @@ class PatientPrescriptionCardOut(BaseModel):
     """
     Prescription card used by the PatientPrescriptions screen in the patient app.
     """
+    model_config = _OUT_CONFIG
+
     prescription_id: str
     medicine: str
     dose: Optional[str] = None
@@ -566,6 +628,8 @@ class PatientOrderReviewOut(BaseModel):
     Full payload for:
       GET /patient/{national_id}/order-review/{prescription_id}
     """
+    model_config = _OUT_CONFIG
+
     prescription: PatientOrderReviewPrescription
     location: PatientOrderReviewLocation
     ml: DeliveryPredictionOut
@@ -610,6 +674,8 @@ class PatientDashboardMapOut(BaseModel):
     Full payload for:
       GET /patient/{national_id}/dashboard-map
     """
+    model_config = _OUT_CONFIG
+
     order_id: Optional[str] = None
     order_code: Optional[str] = None
     status: Optional[str] = None
@@ -621,7 +687,7 @@ class PatientDashboardMapOut(BaseModel):
     arrival_time: Optional[str] = None
     remaining_stability: Optional[str] = None
 
-    notifications: List[PatientDashboardMapNotification] = []
+    notifications: Tuple[PatientDashboardMapNotification, ...] = ()
 
 
 # ============================================================
@@ -635,19 +701,21 @@ class PatientOrderReportOut(BaseModel):
     Used by:
       - GET /patient/{national_id}/reports/{order_id_or_code}
     """
+    model_config = _OUT_CONFIG
+
     # Report meta
     id: str
     type: str
 
-    generated: str  # already formatted
+    generated: datetime
 
     # Order info
     orderID: str
     orderType: Optional[str] = None
     orderStatus: str
 
-    createdAt: str
-    deliveredAt: Optional[str] = None
+    createdAt: Optional[datetime] = None
+    deliveredAt: Optional[datetime] = None
 
     # OTP and verification
     otpCode: str
@@ -666,4 +734,10 @@ class PatientOrderReportOut(BaseModel):
     returnToFridge: Optional[str] = None
 
     # Timeline rows
-    deliveryDetails: List[DeliveryDetail]
+    deliveryDetails: Tuple[DeliveryDetail, ...]
+
+    # Dates stay datetimes until serialization; the app expects the
+    # display string, and "" when a date is missing
+    @field_serializer("generated", "createdAt", "deliveredAt")
+    def _ser_report_dt(self, value: Optional[datetime]) -> str:
+        return format_report_datetime(value) or ""
@@ -8,14 +8,19 @@
 # Optional env:
 #   TEMP_SENSITIVE_CSV=/app/data/output2.csv
 #   SYNTH_MEDS_COUNT=120
+#   SEED_CACHE_DIR=/tmp   (parsed CSV meds are cached here, keyed by file mtime/size)
 # ==========================================================
 
-import os, time, uuid, random, re, csv, json
+import os, io, time, uuid, random, re, csv, json
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 
+import numpy as np
 import psycopg2
+from psycopg2.extras import execute_values
 from faker import Faker
 
 # ==========================================================
@@ -32,8 +37,12 @@ SYNTH_MEDS_COUNT = int(os.getenv("SYNTH_MEDS_COUNT", "120"))
 
 print(f"🔌 Connecting to DB at {DB_HOST}:{DB_PORT} (DB={DB_NAME})")
 
+# Same ~30s overall budget as before, but each attempt is bounded by libpq's
+# connect_timeout and retries every 0.5s, so a DB that comes up late is
+# picked up almost immediately instead of on the next 3s tick.
 conn = None
-for _ in range(10):
+deadline = time.monotonic() + 30
+while time.monotonic() < deadline:
     try:
         conn = psycopg2.connect(
             dbname=DB_NAME,
@@ -41,18 +50,27 @@ for _ in range(10):
             password=DB_PASS,
             host=DB_HOST,
             port=DB_PORT,
+            connect_timeout=2,
+            keepalives=1,
+            keepalives_idle=30,
         )
         print("✅ Connected to PostgreSQL!")
         break
-    except Exception as e:
+    except psycopg2.OperationalError as e:
         print("⏳ Waiting for DB:", e)
-        time.sleep(3)
+        time.sleep(0.5)
 
 if conn is None:
     raise RuntimeError("❌ Could not connect to database.")
 
 cur = conn.cursor()
 
+# The whole reseed (truncate included) runs as ONE transaction, committed at
+# the very end: a single WAL flush, and a failed run leaves the previous data
+# in place because the server rolls back when the connection drops.
+# synchronous_commit only needs to hold for this transaction.
+cur.execute("SET LOCAL synchronous_commit = OFF")
+
 # ==========================================================
 # 2) Wait for ALL Required Tables (before truncate)
 # ==========================================================
@@ -77,14 +95,26 @@ REQUIRED_TABLES = [
     "production_table",
 ]
 
-def table_exists(table_name: str) -> bool:
-    cur.execute("SELECT to_regclass(%s);", (table_name,))
-    return cur.fetchone()[0] is not None
+def missing_tables(table_names: List[str]) -> List[str]:
+    """
+    Names that don't resolve yet, checked in ONE round-trip (to_regclass over the list).
+    Keep "\"Order\"" quoted: to_regclass folds unquoted names to lowercase.
+    """
+    cur.execute(
+        """
+        SELECT t.name
+        FROM unnest(%s::text[]) WITH ORDINALITY AS t(name, pos)
+        WHERE to_regclass(t.name) IS NULL
+        ORDER BY t.pos;
+        """,
+        (table_names,),
+    )
+    return [row[0] for row in cur.fetchall()]
 
 print("⏳ Waiting for all required tables to be created...")
 
 for attempt in range(60):
-    missing = [t for t in REQUIRED_TABLES if not table_exists(t)]
+    missing = missing_tables(REQUIRED_TABLES)
     if not missing:
         print("✅ All tables exist! Continuing with seeding...")
         break
@@ -119,14 +149,60 @@ TABLES_TO_TRUNCATE = [
     "production_table",
 ]
 
-existing = [t for t in TABLES_TO_TRUNCATE if table_exists(t)]
+_absent = set(missing_tables(TABLES_TO_TRUNCATE))
+existing = [t for t in TABLES_TO_TRUNCATE if t not in _absent]
 if existing:
     sql = "TRUNCATE TABLE " + ", ".join(existing) + " RESTART IDENTITY CASCADE;"
     cur.execute(sql)
-    conn.commit()
 else:
     print("⚠️ No tables found to truncate (unexpected). Continuing...")
 
+# ----------------------------------------------------------
+# Bulk-load pattern: drop secondary indexes + FKs on the (now empty)
+# seeded tables, recreate them from their saved definitions at the end.
+# PK/UNIQUE indexes stay (they back constraints and ON CONFLICT).
+# Plain CREATE INDEX on rebuild: CONCURRENTLY can't run inside the
+# single seeding transaction.
+# ----------------------------------------------------------
+
+def drop_bulk_load_constraints(table_names: List[str]) -> Tuple[List[tuple], List[tuple]]:
+    if not table_names:
+        return [], []
+    cur.execute(
+        """
+        SELECT conrelid::regclass::text, quote_ident(conname), pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = ANY(%s::regclass[]);
+        """,
+        (table_names,),
+    )
+    fks = cur.fetchall()
+    cur.execute(
+        """
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = ANY(%s::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid);
+        """,
+        (table_names,),
+    )
+    indexes = cur.fetchall()
+
+    for rel, con, _ in fks:
+        cur.execute(f"ALTER TABLE {rel} DROP CONSTRAINT {con};")
+    for idx, _ in indexes:
+        cur.execute(f"DROP INDEX {idx};")
+    return fks, indexes
+
+def restore_bulk_load_constraints(fks: List[tuple], indexes: List[tuple]) -> None:
+    for _, ddl in indexes:
+        cur.execute(ddl)
+    for rel, con, ddl in fks:
+        cur.execute(f"ALTER TABLE {rel} ADD CONSTRAINT {con} {ddl};")
+
+_dropped_fks, _dropped_indexes = drop_bulk_load_constraints(existing)
+print(f"🔧 Dropped {len(_dropped_fks)} FKs / {len(_dropped_indexes)} indexes for bulk load")
+
 # ==========================================================
 # 3) Utilities
 # ==========================================================
@@ -134,8 +210,33 @@ else:
 fake = Faker("en_US")
 random.seed(42)
 
+# Faker pays a provider dispatch on every call; draw a few hundred name parts
+# once and compose people from them (constant Faker cost, any row count).
+_FIRST_NAMES = tuple({fake.first_name() for _ in range(300)})
+_LAST_NAMES = tuple({fake.last_name() for _ in range(300)})
+_EMAIL_DOMAINS = tuple({fake.free_email_domain() for _ in range(20)})
+
+def pool_name() -> str:
+    return f"{random.choice(_FIRST_NAMES)} {random.choice(_LAST_NAMES)}"
+
+def pool_email() -> str:
+    first = random.choice(_FIRST_NAMES).lower().replace("'", "")
+    last = random.choice(_LAST_NAMES).lower().replace("'", "")
+    return f"{first}.{last}{random.randint(1, 999)}@{random.choice(_EMAIL_DOMAINS)}"
+
+# UUIDs are handed out from a pool filled 4096 at a time by one os.urandom
+# read, instead of one OS RNG call per uuid4().
+_UUID_BATCH = 4096
+_uuid_pool: List[str] = []
+
+def bulk_uuids(n: int) -> List[str]:
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
 def gen_uuid() -> str:
-    return str(uuid.uuid4())
+    if not _uuid_pool:
+        _uuid_pool.extend(bulk_uuids(_UUID_BATCH))
+    return _uuid_pool.pop()
 
 def phone_sa() -> str:
     return f"+9665{random.randint(10000000, 99999999)}"
@@ -143,16 +244,6 @@ def phone_sa() -> str:
 def safe_str(s: str, n: int) -> str:
     return (s or "")[:n]
 
-# Reserve login hospital ID so it never duplicates
-generated_national_ids = {"2181241943"}
-
-def gen_national_id_10() -> str:
-    while True:
-        nid = f"{random.randint(10**9, (10**10) - 1)}"
-        if nid not in generated_national_ids:
-            generated_national_ids.add(nid)
-            return nid
-
 # ------------------ Riyadh Data ------------------
 
 RIYADH_HOSPITALS = [
@@ -163,18 +254,24 @@ RIYADH_HOSPITALS = [
     ("Prince Sultan Military Medical City", "Makkah Al Mukarramah Rd, Riyadh", 24.6867, 46.7081),
 ]
 
-DISTRICTS = [
+DISTRICTS = (
     "Al Olaya", "Al Malaz", "An Nuzhah", "Al Nakheel", "Al Yasmin",
     "Al Qirawan", "Al Nafel", "Diriyah", "Al Rahmaniyah", "Al Hada",
-]
+)
 
-STREETS = [
+STREETS = (
     "King Fahd Road", "Takhassusi Street", "Olaya Street",
     "Imam Saud Road", "Eastern Ring Road", "Northern Ring Road",
-]
+)
+
+# ~8.5k prebuilt addresses; one choice per patient instead of three plus an f-string
+_ADDRESS_POOL = tuple(
+    f"{n} {st}, {d}, Riyadh, SA"
+    for n in range(10, 999, 7) for st in STREETS for d in DISTRICTS
+)
 
 def random_address() -> str:
-    return f"{random.randint(10,999)} {random.choice(STREETS)}, {random.choice(DISTRICTS)}, Riyadh, SA"
+    return random.choice(_ADDRESS_POOL)
 
 def random_coords() -> Tuple[float, float]:
     return round(random.uniform(24.5, 25.0), 6), round(random.uniform(46.5, 47.0), 6)
@@ -183,6 +280,7 @@ def random_coords() -> Tuple[float, float]:
 # 3.5) CSV Path Resolution (NO hardcoded /Users/... in code)
 # ==========================================================
 
+@lru_cache(maxsize=1)
 def resolve_csv_path_optional() -> Optional[str]:
     env_path = (os.getenv("TEMP_SENSITIVE_CSV") or "").strip()
     if env_path and Path(env_path).exists():
@@ -209,20 +307,26 @@ def resolve_csv_path_optional() -> Optional[str]:
 def _norm_key(k: str) -> str:
     return (k or "").strip().lower()
 
-def _get_col_ci(row: dict, *keys: str) -> str:
+def _header_ci(fieldnames: List[str], *keys: str) -> Optional[int]:
+    """Index of the first CSV header matching any of keys (case/space-insensitive); resolved once per file."""
     want = {_norm_key(k) for k in keys if k}
-    for rk, rv in row.items():
-        if _norm_key(rk) in want and rv is not None:
-            return str(rv).strip()
-    return ""
+    for i, h in enumerate(fieldnames or ()):
+        if _norm_key(h) in want:
+            return i
+    return None
+
+_YES_VALUES = frozenset(("yes", "y", "true", "1", "t"))
 
 def parse_yes_no(v: str) -> bool:
-    s = (v or "").strip().lower()
-    return s in ("yes", "y", "true", "1", "t")
+    return (v or "").strip().lower() in _YES_VALUES
+
+_SIGNED_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_NUM_RE = re.compile(r"\d+(?:\.\d+)?")
+_WS_RE = re.compile(r"\s+")
 
 def parse_temp_range(s: str) -> Tuple[float, float]:
     txt = (s or "").replace("−", "-")
-    nums = re.findall(r"-?\d+(?:\.\d+)?", txt)
+    nums = _SIGNED_NUM_RE.findall(txt)
     if len(nums) >= 2:
         a, b = float(nums[0]), float(nums[1])
         return (min(a, b), max(a, b))
@@ -231,25 +335,26 @@ def parse_temp_range(s: str) -> Tuple[float, float]:
         return (x, x)
     return (2.0, 8.0)
 
+_UNIT_RE = re.compile(r"min|hour|hr|day|week|month|year")
+_UNIT_MINUTES = {
+    "min": 1,
+    "hour": 60,
+    "hr": 60,
+    "day": 24 * 60,
+    "week": 7 * 24 * 60,
+    "month": 30 * 24 * 60,
+    "year": 365 * 24 * 60,
+}
+
 def duration_to_minutes_approx(s: str) -> Optional[int]:
     txt = (s or "").strip().lower()
-    m = re.findall(r"\d+(?:\.\d+)?", txt)
+    m = _NUM_RE.search(txt)
     if not m:
         return None
-    val = float(m[0])
-    if "min" in txt:
-        return int(val)
-    if "hour" in txt or "hr" in txt:
-        return int(val * 60)
-    if "day" in txt:
-        return int(val * 24 * 60)
-    if "week" in txt:
-        return int(val * 7 * 24 * 60)
-    if "month" in txt:
-        return int(val * 30 * 24 * 60)
-    if "year" in txt:
-        return int(val * 365 * 24 * 60)
-    return None
+    unit = _UNIT_RE.search(txt, m.end())
+    if not unit:
+        return None
+    return int(float(m.group()) * _UNIT_MINUTES[unit.group()])
 
 def classify_risk(max_time_excursion: str) -> str:
     mins = duration_to_minutes_approx(max_time_excursion)
@@ -261,9 +366,11 @@ def classify_risk(max_time_excursion: str) -> str:
         return "High"
     return "Medium"
 
+# Product names repeat across CSV rows and synthetic draws; the regex runs once per distinct name.
+@lru_cache(maxsize=8192)
 def clean_card_label(name: str) -> str:
     n = (name or "").strip()
-    n = re.sub(r"\s+", " ", n)
+    n = _WS_RE.sub(" ", n)
     return safe_str(n, 100)
 
 # ==========================================================
@@ -271,21 +378,38 @@ def clean_card_label(name: str) -> str:
 # ==========================================================
 
 def load_csv_meds(csv_path: str) -> List[Dict]:
-    meds_map: Dict[str, Dict] = {}
+    meds_map: Dict[tuple, Dict] = {}
+
+    with open(csv_path, "r", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+        # plain reader + header -> index resolved once; no dict built per row
+        reader = csv.reader(f)
+        cols = next(reader, [])
+        h_product = _header_ci(cols, "Product Name", "product_name", "ProductName")
+        h_desc = _header_ci(cols, "Description", "description")
+        h_info_src = _header_ci(cols, "Information Source", "information_source", "InformationSource")
+        h_max_time = _header_ci(cols, "Maximum Time For excursion", "Maximum Time for excursion", "max_time_excursion")
+        h_temp_range = _header_ci(cols, "Temperature Range For excursion", "Temperature Range for excursion", "temp_range_excursion")
+        h_rtf = _header_ci(cols, "Return to the fridge", "return_to_fridge")
+        h_use_within = _header_ci(cols, "Use product within max time for excursion", "use_within_max_time")
+        h_actions_flag = _header_ci(cols, "Additional actions following excursion", "additional_actions_following_excursion")
+        h_actions_detail = _header_ci(cols, "Additional actions detail", "additional_actions_detail")
+
+        # One itemgetter pulls all nine fields per row in C. Rows are padded/cut
+        # to the header width plus one "" slot that missing headers point at.
+        pad = len(cols)
+        fields = itemgetter(*(pad if h is None else h for h in (
+            h_product, h_desc, h_info_src, h_max_time, h_temp_range,
+            h_rtf, h_use_within, h_actions_flag, h_actions_detail,
+        )))
 
-    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
         for row in reader:
-            product = _get_col_ci(row, "Product Name", "product_name", "ProductName")
-            desc = _get_col_ci(row, "Description", "description")
-            info_src = _get_col_ci(row, "Information Source", "information_source", "InformationSource")
-            max_time = _get_col_ci(row, "Maximum Time For excursion", "Maximum Time for excursion", "max_time_excursion")
-            temp_range = _get_col_ci(row, "Temperature Range For excursion", "Temperature Range for excursion", "temp_range_excursion")
-
-            rtf = _get_col_ci(row, "Return to the fridge", "return_to_fridge")
-            use_within = _get_col_ci(row, "Use product within max time for excursion", "use_within_max_time")
-            actions_flag = _get_col_ci(row, "Additional actions following excursion", "additional_actions_following_excursion")
-            actions_detail = _get_col_ci(row, "Additional actions detail", "additional_actions_detail")
+            if len(row) != pad:
+                row = (row + [""] * pad)[:pad]
+            row.append("")
+            (
+                product, desc, info_src, max_time, temp_range,
+                rtf, use_within, actions_flag, actions_detail,
+            ) = [v.strip() for v in fields(row)]
 
             # ✅ Name AS-IS from Product Name (card label)
             name = clean_card_label(product)
@@ -296,11 +420,11 @@ def load_csv_meds(csv_path: str) -> List[Dict]:
                 continue
 
             min_exc, max_exc = parse_temp_range(temp_range)
-            risk = classify_risk(max_time)
 
-            key = f"{name.lower()}|{min_exc}|{max_exc}|{(max_time or '').lower()}"
+            key = (name.lower(), min_exc, max_exc, (max_time or "").lower())
             if key in meds_map:
                 continue
+            risk = classify_risk(max_time)
 
             meds_map[key] = {
                 "name": name,
@@ -321,6 +445,33 @@ def load_csv_meds(csv_path: str) -> List[Dict]:
         raise RuntimeError("❌ CSV parsed but no medication rows found (check headers/format).")
     return meds
 
+def load_csv_meds_cached(csv_path: str) -> List[Dict]:
+    """
+    load_csv_meds() with an on-disk cache: a restart against the same CSV
+    (same mtime + size) reads the parsed rows back instead of re-parsing.
+    """
+    st = os.stat(csv_path)
+    cache_dir = Path(os.getenv("SEED_CACHE_DIR", "/tmp"))
+    cache_file = cache_dir / f"meds_{Path(csv_path).stem}_{int(st.st_mtime)}_{st.st_size}.json"
+
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass  # corrupt/partial cache -> re-parse below
+
+    meds = load_csv_meds(csv_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meds, f)
+        tmp.replace(cache_file)
+    except Exception:
+        pass  # cache is best-effort
+    return meds
+
 def generate_synthetic_meds(n: int) -> List[Dict]:
     """
     Synthetic meds that mimic output2 semantics:
@@ -357,50 +508,61 @@ def generate_synthetic_meds(n: int) -> List[Dict]:
         (15.0, 30.0),
     ]
 
-    meds = []
-    seen = set()
+    action_texts = [
+        "Do not use if exposed beyond allowed excursion time.",
+        "Discard if uncertain; follow product licence guidance.",
+        "Inspect visually; if abnormal, do not use and contact pharmacy.",
+        "Record excursion and consult pharmacist before use.",
+    ]
 
-    for i in range(max(20, n)):
-        name = random.choice(base_names)
+    # Draw every random value for all candidates in one vectorized pass;
+    # the loop below only materializes dicts.
+    total = max(20, n)
+    # seeded from the stdlib stream so random.seed(42) keeps runs reproducible
+    rng = np.random.default_rng(random.getrandbits(64))
+    name_idx = rng.integers(0, len(base_names), total)
+    strength_idx = rng.integers(0, len(strengths), total)
+    form_idx = rng.integers(0, len(forms), total)
+    temp_idx = rng.integers(0, len(temp_pool), total)
+    dur_idx = rng.integers(0, len(duration_pool), total)
+    source_idx = rng.integers(0, len(sources), total)
+    action_idx = rng.integers(0, len(action_texts), total)
+    flags = rng.random(total) < 0.35
+    rtf = rng.random(total) < 0.55
+    safe = rng.random(total) < 0.75
+
+    # The (label, temp range, duration) key is fully determined by these
+    # index columns, so dedup is a row-unique over them (first draw wins).
+    combos = np.column_stack((name_idx, strength_idx, form_idx, temp_idx, dur_idx))
+    _, first = np.unique(combos, axis=0, return_index=True)
+    first.sort()
+
+    meds = []
+    for i in first[:n].tolist():
         # add variation without breaking "card label" vibe
-        label = f"{name} {random.choice(strengths)} {random.choice(forms)}"
-        label = clean_card_label(label)
-
-        (mn, mx) = random.choice(temp_pool)
-        max_time = random.choice(duration_pool)
-
-        key = f"{label.lower()}|{mn}|{mx}|{max_time.lower()}"
-        if key in seen:
-            continue
-        seen.add(key)
-
-        actions_flag = random.random() < 0.35
-        actions_detail = ""
-        if actions_flag:
-            actions_detail = random.choice([
-                "Do not use if exposed beyond allowed excursion time.",
-                "Discard if uncertain; follow product licence guidance.",
-                "Inspect visually; if abnormal, do not use and contact pharmacy.",
-                "Record excursion and consult pharmacist before use.",
-            ])
+        label = clean_card_label(
+            f"{base_names[name_idx[i]]} {strengths[strength_idx[i]]} {forms[form_idx[i]]}"
+        )
+        (mn, mx) = temp_pool[temp_idx[i]]
+        max_time = duration_pool[dur_idx[i]]
+
+        actions_flag = bool(flags[i])
+        actions_detail = action_texts[action_idx[i]] if actions_flag else ""
 
         meds.append({
             "name": label,
             "description": safe_str(f"{label} (synthetic, mimics output2)", 200),
-            "information_source": random.choice(sources),
+            "information_source": sources[source_idx[i]],
             "max_time_exertion": max_time,
             "min_exc": float(mn),
             "max_exc": float(mx),
-            "return_to_fridge": random.random() < 0.55,
-            "max_time_safe_use": random.random() < 0.75,
+            "return_to_fridge": bool(rtf[i]),
+            "max_time_safe_use": bool(safe[i]),
             "actions_detail": safe_str(actions_detail, 200),
             "actions_flag": actions_flag,
             "risk_level": classify_risk(max_time),
         })
 
-        if len(meds) >= n:
-            break
-
     if not meds:
         raise RuntimeError("❌ Synthetic meds generation failed unexpectedly.")
     return meds
@@ -408,7 +570,7 @@ def generate_synthetic_meds(n: int) -> List[Dict]:
 csv_path = resolve_csv_path_optional()
 if csv_path:
     print(f"📄 Loading medications from CSV (card labels): {csv_path}")
-    CSV_MEDS = load_csv_meds(csv_path)
+    CSV_MEDS = load_csv_meds_cached(csv_path)
     print(f"✅ Loaded {len(CSV_MEDS)} medications from CSV")
 else:
     print("⚠️ output2.csv NOT FOUND inside container.")
@@ -425,6 +587,7 @@ medication_ids: List[str] = []
 
 print("💊 Inserting medications into medication table...")
 
+med_rows: List[tuple] = []
 for med in CSV_MEDS:
     medication_id = gen_uuid()
     medication_ids.append(medication_id)
@@ -433,17 +596,7 @@ for med in CSV_MEDS:
     if med["actions_flag"] and not additional_actions:
         additional_actions = "Follow product licence excursion actions."
 
-    cur.execute(
-        """
-        INSERT INTO medication (
-            medication_id, name, description, information_source,
-            exp_date, max_time_exertion,
-            min_temp_range_excursion, max_temp_range_excursion,
-            return_to_the_fridge, max_time_safe_use,
-            additional_actions_detail, risk_level
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    med_rows.append(
         (
             medication_id,
             med["name"],
@@ -457,10 +610,25 @@ for med in CSV_MEDS:
             med["max_time_safe_use"],
             additional_actions,
             med["risk_level"],
-        ),
+        )
     )
 
-conn.commit()
+# One multi-row INSERT per page instead of a round-trip per medication.
+execute_values(
+    cur,
+    """
+    INSERT INTO medication (
+        medication_id, name, description, information_source,
+        exp_date, max_time_exertion,
+        min_temp_range_excursion, max_temp_range_excursion,
+        return_to_the_fridge, max_time_safe_use,
+        additional_actions_detail, risk_level
+    )
+    VALUES %s
+    """,
+    med_rows,
+    page_size=500,
+)
 
 # ==========================================================
 # 4) Config
@@ -474,6 +642,17 @@ MIN_MEDS_PER_HOSPITAL = 8
 MAX_MEDS_PER_HOSPITAL = 15
 NUM_ORDERS = 50
 
+# National IDs: one distinct sample of the 10-digit space, drawn up front
+# (upper bound of hospitals + patients + drivers), reserved login ID excluded.
+LOGIN_HOSPITAL_NATIONAL_ID = 2181241943
+_NATIONAL_IDS_NEEDED = (NUM_HOSPITALS - 1) + NUM_HOSPITALS * (MAX_PATIENTS_PER_HOSPITAL + DRIVERS_PER_HOSPITAL)
+_national_id_pool = iter(
+    [n for n in random.sample(range(10**9, 10**10), _NATIONAL_IDS_NEEDED + 1) if n != LOGIN_HOSPITAL_NATIONAL_ID]
+)
+
+def gen_national_id_10() -> str:
+    return str(next(_national_id_pool))
+
 hospital_ids: List[str] = []
 hospital_info: Dict[str, Dict] = {}
 patients_by_hospital: Dict[str, List[str]] = {}
@@ -484,34 +663,19 @@ orders_meta: Dict[str, Dict] = {}
 
 REQUEST_STATUSES = ["pending", "approved", "rejected", "resolved"]
 
-def pick_priority() -> str:
-    r = random.random()
-    if r < 0.6:
-        return "Normal"
-    elif r < 0.9:
-        return "High"
-    else:
-        return "Critical"
+# Weighted pickers: (population, cumulative weights) for random.choices,
+# drawn for all orders at once before the order loop.
+PRIORITY_PICK = (("Normal", "High", "Critical"), (0.60, 0.90, 1.0))
+ORDER_TYPE_PICK = (("delivery", "pickup"), (0.75, 1.0))
+ORDER_STATUS_PICK = (
+    ("pending", "accepted", "on_delivery", "on_route", "delivered", "rejected", "delivery_failed"),
+    (0.25, 0.40, 0.55, 0.65, 0.80, 0.90, 1.0),
+)
+SCENARIO_PICK = (("normal", "excursion", "delay", "both"), (0.40, 0.70, 0.85, 1.0))
 
-def pick_order_type() -> str:
-    return "delivery" if random.random() < 0.75 else "pickup"
-
-def pick_order_status() -> str:
-    r = random.random()
-    if r < 0.25:
-        return "pending"
-    elif r < 0.40:
-        return "accepted"
-    elif r < 0.55:
-        return "on_delivery"
-    elif r < 0.65:
-        return "on_route"
-    elif r < 0.80:
-        return "delivered"
-    elif r < 0.90:
-        return "rejected"
-    else:
-        return "delivery_failed"
+def pick_many(pick: Tuple[tuple, tuple], k: int) -> List[str]:
+    population, cum_weights = pick
+    return random.choices(population, cum_weights=cum_weights, k=k)
 
 def random_temp_value(scenario: str) -> float:
     base = random.uniform(2.0, 7.8)
@@ -527,6 +691,19 @@ print("🏥 Seeding Hospitals, Patients, Drivers, Hospital_Medication, Prescript
 
 chosen_hospitals = random.sample(RIYADH_HOSPITALS, k=NUM_HOSPITALS)
 
+# Rows are built in Python first, then written one table at a time (parents
+# before children, so FKs hold) with a single multi-row INSERT each.
+hospital_rows: List[tuple] = []
+patient_rows: List[tuple] = []
+driver_rows: List[tuple] = []
+hospital_med_rows: List[tuple] = []
+prescription_rows: List[tuple] = []
+
+# Per-hospital medication picks sample from one array built up front; the
+# generator follows random.seed(42) like the rest of the script.
+_rng = np.random.default_rng(random.getrandbits(64))
+_med_ids_np = np.array(medication_ids, dtype=object)
+
 for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
     hospital_id = gen_uuid()
     hospital_ids.append(hospital_id)
@@ -541,17 +718,10 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
         hosp_name = "Teryaq Test Hospital"
     else:
         national_id = gen_national_id_10()
-        email = fake.email()
+        email = pool_email()
         hosp_name = name
 
-    cur.execute(
-        """
-        INSERT INTO hospital (
-            hospital_id, firebase_uid, national_id, name, address,
-            email, phone_number, lat, lon, status
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    hospital_rows.append(
         (
             hospital_id,
             firebase_uid,
@@ -563,7 +733,7 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
             h_lat,
             h_lon,
             random.choice(["active", "suspended", "active"]),
-        ),
+        )
     )
 
     # Patients
@@ -577,30 +747,22 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
         plat, plon = random_coords()
         birth_date = fake.date_of_birth(minimum_age=1, maximum_age=90)
 
-        cur.execute(
-            """
-            INSERT INTO patient (
-                patient_id, firebase_uid, national_id, hospital_id,
-                name, address, email, phone_number, gender, birth_date,
-                lat, lon, status
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        patient_rows.append(
             (
                 patient_id,
                 p_firebase_uid,
                 p_national_id,
                 hospital_id,
-                fake.name(),
+                pool_name(),
                 random_address(),
-                fake.email(),
+                pool_email(),
                 phone_sa(),
                 random.choice(["Male", "Female"]),
                 birth_date,
                 plat,
                 plon,
                 "active",
-            ),
+            )
         )
         patients_by_hospital[hospital_id].append(patient_id)
 
@@ -612,45 +774,34 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
         d_national_id = gen_national_id_10()
         dlat, dlon = random_coords()
 
-        cur.execute(
-            """
-            INSERT INTO driver (
-                driver_id, firebase_uid, national_id, hospital_id,
-                name, email, phone_number, address,
-                lat, lon, status
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        driver_rows.append(
             (
                 driver_id,
                 d_firebase_uid,
                 d_national_id,
                 hospital_id,
-                fake.name(),
-                fake.email(),
+                pool_name(),
+                pool_email(),
                 phone_sa(),
                 random_address(),
                 dlat,
                 dlon,
                 random.choice(["active", "offline", "blocked", "active"]),
-            ),
+            )
         )
         drivers_by_hospital[hospital_id].append(driver_id)
         driver_ids.append(driver_id)
 
     # Hospital_Medication + Prescriptions
     num_meds = random.randint(MIN_MEDS_PER_HOSPITAL, MAX_MEDS_PER_HOSPITAL)
-    chosen_med_ids = medication_ids[:] if len(medication_ids) <= num_meds else random.sample(medication_ids, k=num_meds)
+    chosen_med_ids = (
+        medication_ids
+        if len(medication_ids) <= num_meds
+        else _rng.choice(_med_ids_np, size=num_meds, replace=False).tolist()
+    )
 
     for medication_id in chosen_med_ids:
-        cur.execute(
-            """
-            INSERT INTO hospital_medication (hospital_id, medication_id, availability)
-            VALUES (%s,%s,%s)
-            ON CONFLICT DO NOTHING
-            """,
-            (hospital_id, medication_id, True),
-        )
+        hospital_med_rows.append((hospital_id, medication_id, True))
 
         for _ in range(random.randint(1, 4)):
             if not patients_by_hospital[hospital_id]:
@@ -658,14 +809,7 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
             presc_id = gen_uuid()
             patient_id = random.choice(patients_by_hospital[hospital_id])
 
-            cur.execute(
-                """
-                INSERT INTO prescription (
-                    prescription_id, hospital_id, medication_id, patient_id,
-                    expiration_date, reorder_threshold, instructions, prescribing_doctor
-                )
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-                """,
+            prescription_rows.append(
                 (
                     presc_id,
                     hospital_id,
@@ -674,13 +818,74 @@ for idx, (name, addr, h_lat, h_lon) in enumerate(chosen_hospitals):
                     datetime.now() + timedelta(days=random.randint(90, 365)),
                     random.randint(1, 5),
                     "Use as prescribed",
-                    fake.name(),
-                ),
+                    pool_name(),
+                )
             )
 
             prescriptions.append({"prescription_id": presc_id, "hospital_id": hospital_id, "patient_id": patient_id})
 
-conn.commit()
+execute_values(
+    cur,
+    """
+    INSERT INTO hospital (
+        hospital_id, firebase_uid, national_id, name, address,
+        email, phone_number, lat, lon, status
+    )
+    VALUES %s
+    """,
+    hospital_rows,
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO patient (
+        patient_id, firebase_uid, national_id, hospital_id,
+        name, address, email, phone_number, gender, birth_date,
+        lat, lon, status
+    )
+    VALUES %s
+    """,
+    patient_rows,
+    page_size=500,
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO driver (
+        driver_id, firebase_uid, national_id, hospital_id,
+        name, email, phone_number, address,
+        lat, lon, status
+    )
+    VALUES %s
+    """,
+    driver_rows,
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO hospital_medication (hospital_id, medication_id, availability)
+    VALUES %s
+    ON CONFLICT DO NOTHING
+    """,
+    hospital_med_rows,
+    page_size=500,
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO prescription (
+        prescription_id, hospital_id, medication_id, patient_id,
+        expiration_date, reorder_threshold, instructions, prescribing_doctor
+    )
+    VALUES %s
+    """,
+    prescription_rows,
+    page_size=1000,
+)
 
 # ==========================================================
 # 6) Generate Orders + Telemetry + Notifications + Reports
@@ -688,7 +893,37 @@ conn.commit()
 
 print("📦 Generating Orders & Telemetry...")
 
-for _ in range(NUM_ORDERS):
+# Telemetry is collected across all orders and streamed in with COPY after
+# the loop. COPY takes no expressions, so recorded_at is computed here from
+# one reference time: the transaction's own NOW(), read from the server
+# (as the timestamp the other rows' NOW() stores), so telemetry lines up with
+# its orders regardless of the client clock or timezone.
+temp_rows: List[tuple] = []
+gps_rows: List[tuple] = []
+cur.execute("SELECT LOCALTIMESTAMP")
+telemetry_now = cur.fetchone()[0]
+
+def copy_rows(table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV)", buf)
+
+order_scenarios = pick_many(SCENARIO_PICK, NUM_ORDERS)
+order_statuses = pick_many(ORDER_STATUS_PICK, NUM_ORDERS)
+order_priorities = pick_many(PRIORITY_PICK, NUM_ORDERS)
+order_types = pick_many(ORDER_TYPE_PICK, NUM_ORDERS)
+
+# Per-order tables are collected here too and written after the loop,
+# parents first (dashboard -> "Order" -> dependents).
+dashboard_rows: List[tuple] = []
+order_rows: List[tuple] = []
+delivery_time_rows: List[tuple] = []
+stability_time_rows: List[tuple] = []
+notification_rows: List[tuple] = []
+report_rows: List[tuple] = []
+
+for i in range(NUM_ORDERS):
     order_id = gen_uuid()
     dashboard_id = gen_uuid()
 
@@ -700,31 +935,11 @@ for _ in range(NUM_ORDERS):
     d_candidates = drivers_by_hospital.get(hospital_id, [])
     driver_id = random.choice(d_candidates) if d_candidates else random.choice(driver_ids)
 
-    r = random.random()
-    if r < 0.40:
-        scenario = "normal"
-    elif r < 0.70:
-        scenario = "excursion"
-    elif r < 0.85:
-        scenario = "delay"
-    else:
-        scenario = "both"
-
-    cur.execute("""INSERT INTO dashboard (dashboard_id) VALUES (%s)""", (dashboard_id,))
+    scenario = order_scenarios[i]
 
-    order_status = pick_order_status()
-    order_priority = pick_priority()
-    order_type = pick_order_type()
+    dashboard_rows.append((dashboard_id,))
 
-    cur.execute(
-        """
-        INSERT INTO "Order" (
-            order_id, driver_id, patient_id, hospital_id, prescription_id,
-            dashboard_id, description, notes, priority_level, order_type,
-            OTP, status
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    order_rows.append(
         (
             order_id,
             driver_id,
@@ -734,11 +949,11 @@ for _ in range(NUM_ORDERS):
             dashboard_id,
             f"Auto-generated {scenario} order",
             f"Auto-notes: scenario={scenario}",
-            order_priority,
-            order_type,
+            order_priorities[i],
+            order_types[i],
             random.randint(1000, 9999),
-            order_status,
-        ),
+            order_statuses[i],
+        )
     )
 
     orders_meta[order_id] = {"hospital_id": hospital_id, "patient_id": patient_id, "driver_id": driver_id, "scenario": scenario}
@@ -746,24 +961,12 @@ for _ in range(NUM_ORDERS):
     for _ in range(random.randint(8, 20)):
         minutes_ago = random.randint(5, 240)
         temp_val = random_temp_value(scenario)
-        cur.execute(
-            """
-            INSERT INTO temperature (temperature_id, dashboard_id, temp_value, recorded_at)
-            VALUES (%s,%s,%s,NOW() - INTERVAL '%s minutes')
-            """,
-            (gen_uuid(), dashboard_id, str(temp_val), minutes_ago),
-        )
+        temp_rows.append((gen_uuid(), dashboard_id, str(temp_val), telemetry_now - timedelta(minutes=minutes_ago)))
 
     for _ in range(random.randint(8, 20)):
         lat, lon = random_coords()
         minutes_ago = random.randint(5, 240)
-        cur.execute(
-            """
-            INSERT INTO gps (gps_id, dashboard_id, latitude, longitude, recorded_at)
-            VALUES (%s,%s,%s,%s,NOW() - INTERVAL '%s minutes')
-            """,
-            (gen_uuid(), dashboard_id, lat, lon, minutes_ago),
-        )
+        gps_rows.append((gen_uuid(), dashboard_id, lat, lon, telemetry_now - timedelta(minutes=minutes_ago)))
 
     if scenario == "normal":
         stability = random.randint(120, 240)
@@ -778,48 +981,81 @@ for _ in range(NUM_ORDERS):
         stability = random.randint(60, 150)
         delivery = random.randint(stability + 20, stability + 150)
 
-    cur.execute(
-        """
-        INSERT INTO estimated_delivery_time (estimated_delivery_id, dashboard_id, delay_time, recorded_at)
-        VALUES (%s,%s,%s,NOW())
-        """,
-        (gen_uuid(), dashboard_id, timedelta(minutes=delivery)),
-    )
-
-    cur.execute(
-        """
-        INSERT INTO estimated_stability_time (estimated_stability_id, dashboard_id, stability_time, recorded_at)
-        VALUES (%s,%s,%s,NOW())
-        """,
-        (gen_uuid(), dashboard_id, timedelta(minutes=stability)),
-    )
+    delivery_time_rows.append((gen_uuid(), dashboard_id, timedelta(minutes=delivery)))
+    stability_time_rows.append((gen_uuid(), dashboard_id, timedelta(minutes=stability)))
 
-    cur.execute(
-        """
-        INSERT INTO notification (
-            notification_id, order_id, notification_type,
-            notification_content, notification_time
-        )
-        VALUES (%s,%s,%s,%s,%s)
-        """,
+    notification_rows.append(
         (
             gen_uuid(),
             order_id,
             "info",
             f"Order {order_id} created (scenario={scenario}).",
             datetime.now() - timedelta(minutes=random.randint(10, 120)),
-        ),
+        )
     )
 
-    cur.execute(
-        """
-        INSERT INTO report (report_id, order_id, report_type, report_content)
-        VALUES (%s,%s,%s,%s)
-        """,
-        (gen_uuid(), order_id, "auto", f"Summary: scenario={scenario}, delivery={delivery}min, stability={stability}min."),
+    report_rows.append(
+        (gen_uuid(), order_id, "auto", f"Summary: scenario={scenario}, delivery={delivery}min, stability={stability}min.")
     )
 
-conn.commit()
+execute_values(cur, """INSERT INTO dashboard (dashboard_id) VALUES %s""", dashboard_rows)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO "Order" (
+        order_id, driver_id, patient_id, hospital_id, prescription_id,
+        dashboard_id, description, notes, priority_level, order_type,
+        OTP, status
+    )
+    VALUES %s
+    """,
+    order_rows,
+)
+
+copy_rows("temperature", ("temperature_id", "dashboard_id", "temp_value", "recorded_at"), temp_rows)
+copy_rows("gps", ("gps_id", "dashboard_id", "latitude", "longitude", "recorded_at"), gps_rows)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO estimated_delivery_time (estimated_delivery_id, dashboard_id, delay_time, recorded_at)
+    VALUES %s
+    """,
+    delivery_time_rows,
+    template="(%s,%s,%s,NOW())",
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO estimated_stability_time (estimated_stability_id, dashboard_id, stability_time, recorded_at)
+    VALUES %s
+    """,
+    stability_time_rows,
+    template="(%s,%s,%s,NOW())",
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO notification (
+        notification_id, order_id, notification_type,
+        notification_content, notification_time
+    )
+    VALUES %s
+    """,
+    notification_rows,
+)
+
+execute_values(
+    cur,
+    """
+    INSERT INTO report (report_id, order_id, report_type, report_content)
+    VALUES %s
+    """,
+    report_rows,
+)
 
 # ==========================================================
 # ✅ Ensure pending orders per hospital
@@ -837,25 +1073,29 @@ for hid in hospital_ids:
             cur.execute("""UPDATE "Order" SET status='pending' WHERE order_id=%s;""", (row[0],))
             print(f"   • Forced pending order for hospital {hid} (order_id={row[0]})")
 
-conn.commit()
-
 # ==========================================================
 # 7) Requests
 # ==========================================================
 
 print("📝 Generating Requests...")
 
+request_rows: List[tuple] = []
 for order_id, meta in orders_meta.items():
     if random.random() < 0.35:
         req_status = random.choice(REQUEST_STATUSES)
-        cur.execute(
-            """
-            INSERT INTO requests (request_id, hospital_id, order_id, status, request_content)
-            VALUES (%s,%s,%s,%s,%s)
-            """,
-            (gen_uuid(), meta["hospital_id"], order_id, req_status, f"Request status '{req_status}' for order {order_id}"),
+        request_rows.append(
+            (gen_uuid(), meta["hospital_id"], order_id, req_status, f"Request status '{req_status}' for order {order_id}")
         )
 
+execute_values(
+    cur,
+    """
+    INSERT INTO requests (request_id, hospital_id, order_id, status, request_content)
+    VALUES %s
+    """,
+    request_rows,
+)
+
 # ==========================================================
 # 8) Staging & Production dummy JSON
 # ==========================================================
@@ -870,6 +1110,9 @@ cur.execute(
     (json.dumps({"sample": "production_record", "ts": datetime.now().isoformat()}),),
 )
 
+print("🔧 Recreating indexes and FKs...")
+restore_bulk_load_constraints(_dropped_fks, _dropped_indexes)
+
 conn.commit()
 cur.close()
 conn.close()
@@ -1,9 +1,12 @@
 import os
 import json
 import re
+from functools import lru_cache
 import pandas as pd
 import psycopg2
-from sqlalchemy import create_engine, text
+from psycopg2.extras import execute_values
+import torch
+from sqlalchemy import create_engine
 from hijri_converter import convert
 from transformers import pipeline
 from rapidfuzz import process, fuzz
@@ -34,24 +37,64 @@ COLUMN_MAPPING = {
     "external_id": "patient_external_id", "patientid": "patient_external_id"
 }
 
-classifier = pipeline(
-    "zero-shot-classification",
-    model="facebook/bart-large-mnli"
-)
-
-def map_columns(df: pd.DataFrame) -> pd.DataFrame:
+TARGET_COLUMNS = ["patient_name", "date_of_birth", "medication", "hospital_id", "patient_external_id"]
+
+# الموديل (~1.6GB) ما يتحمل إلا أول مرة نحتاجه فعلاً، مو وقت الـ import
+@lru_cache(maxsize=1)
+def get_classifier():
+    # GPU + fp16 when available; CPU stays on fp32 (fp16 is slower there)
+    use_cuda = torch.cuda.is_available()
+    return pipeline(
+        "zero-shot-classification",
+        model="facebook/bart-large-mnli",
+        device=0 if use_cuda else -1,
+        model_kwargs={"torch_dtype": torch.float16} if use_cuda else {},
+    )
+
+
+# column name -> label من تصنيفات سابقة، محفوظ على الديسك بين التشغيلات
+COLUMN_LABEL_CACHE = os.path.join(os.getenv("ETL_CACHE_DIR", "/tmp"), "etl_column_labels.json")
+
+@lru_cache(maxsize=1)
+def _column_label_cache() -> dict:
+    try:
+        with open(COLUMN_LABEL_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_column_label_cache(cache: dict) -> None:
+    tmp = COLUMN_LABEL_CACHE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp, COLUMN_LABEL_CACHE)
+    except OSError as e:
+        print("[WARN] Could not persist column label cache:", e)
+
+def classify_columns(cols) -> dict:
+    cache = _column_label_cache()
+    todo = list(dict.fromkeys(c for c in cols if cache.get(c) not in TARGET_COLUMNS))
+    if todo:
+        # كل الأعمدة الجديدة في batch واحد بدل forward pass لكل عمود
+        results = get_classifier()(todo, candidate_labels=TARGET_COLUMNS, multi_label=False)
+        if isinstance(results, dict):  # some transformers versions unwrap a 1-item batch
+            results = [results]
+        for col, res in zip(todo, results):
+            cache[col] = res["labels"][0]
+        _save_column_label_cache(cache)
+    return {c: cache[c] for c in cols}
+
+def build_column_mapping(columns) -> dict:
     mapped = {}
     used = set()
-    for col in df.columns:
+
+    unknowns = [col for col in columns if col.strip().lower() not in COLUMN_MAPPING]
+    guessed = classify_columns(unknowns) if unknowns else {}
+
+    for col in columns:
         key = col.strip().lower()
-        if key in COLUMN_MAPPING:
-            new_col = COLUMN_MAPPING[key]
-        else:
-            result = classifier(
-                col,
-                candidate_labels=["patient_name", "date_of_birth", "medication", "hospital_id", "patient_external_id"]
-            )
-            new_col = result["labels"][0]
+        new_col = COLUMN_MAPPING[key] if key in COLUMN_MAPPING else guessed[col]
 
         # لو الاسم مكرر نضيف suffix
         if new_col in used:
@@ -64,7 +107,11 @@ def map_columns(df: pd.DataFrame) -> pd.DataFrame:
         used.add(new_col)
 
     print("[INFO] Column mapping:", mapped)
-    return df.rename(columns=mapped)
+    return mapped
+
+
+def map_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rename(columns=build_column_mapping(df.columns))
 
 
 # =====================================================
@@ -77,6 +124,11 @@ AR_HIJRI_MONTHS = {
     "ذو القعدة": 11, "ذو الحجة": 12, "ذى القعدة": 11, "ذى الحجة": 12
 }
 
+_HIJRI_WORDS_RE = re.compile(r"(\d{1,2})\s+([^\s]+)\s+(\d{3,4})")
+_DIGITS_RE = re.compile(r"\d+")
+
+# patient files repeat the same raw values a lot; each distinct one is parsed once
+@lru_cache(maxsize=100_000)
 def normalize_date(date_str: str):
     if not date_str or str(date_str).strip() == "":
         return None
@@ -90,7 +142,7 @@ def normalize_date(date_str: str):
         pass
 
     # Hijri in Arabic words (e.g. "10 رجب 1447")
-    m = re.search(r"(\d{1,2})\s+([^\s]+)\s+(\d{3,4})", s)
+    m = _HIJRI_WORDS_RE.search(s)
     if m:
         d = int(m.group(1))
         month_name = m.group(2).replace("ـ", "").strip()
@@ -101,7 +153,7 @@ def normalize_date(date_str: str):
             return pd.to_datetime(f"{g.year}-{g.month}-{g.day}").date()
 
     # Hijri digits (1447-07-15)
-    digits = re.findall(r"\d+", s)
+    digits = _DIGITS_RE.findall(s)
     if len(digits) == 3 and len(digits[0]) <= 4 and int(digits[0]) < 1600:
         try:
             hy, hm, hd = map(int, digits)
@@ -113,6 +165,23 @@ def normalize_date(date_str: str):
     return None
 
 
+def normalize_date_series(col: pd.Series) -> pd.Series:
+    """ISO text goes through one vectorized to_datetime; every other row
+    (day/month orders, Hijri, blanks) goes through normalize_date. Letting
+    to_datetime infer the format would take it from the first row and make
+    the result depend on row order. Other dtypes (e.g. int 19900512) would
+    be read as epoch offsets by to_datetime, so they stay on the per-value
+    path."""
+    if not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)):
+        return col.map(normalize_date).astype(object)
+    parsed = pd.to_datetime(col, errors="coerce", format="ISO8601")
+    out = parsed.dt.date.astype(object)
+    miss = parsed.isna()
+    if miss.any():
+        out[miss] = col[miss].map(normalize_date)
+    return out
+
+
 # =====================================================
 # 4. Medication Normalization
 # =====================================================
@@ -125,6 +194,7 @@ ARABIC_TO_ENGLISH = {
     "اموكسيسيلين": "Amoxicillin",
 }
 
+@lru_cache(maxsize=100_000)
 def normalize_medication(raw: str):
     if not raw:
         return raw
@@ -137,6 +207,32 @@ def normalize_medication(raw: str):
     return match if score >= 80 else raw
 
 
+def normalize_medication_series(col: pd.Series) -> pd.Series:
+    """Same result as col.apply(normalize_medication), but each distinct value
+    is resolved once and all fuzzy matches come from one cdist matrix."""
+    mapping = {}
+    todo = []
+    for v in col.dropna().unique():
+        if not v:
+            mapping[v] = v
+            continue
+        hit = ARABIC_TO_ENGLISH.get(v.strip())
+        if hit:
+            mapping[v] = hit
+        else:
+            todo.append(v)
+
+    if todo:
+        queries = [v.strip() for v in todo]
+        scores = process.cdist(queries, CANONICAL_MEDS, scorer=fuzz.WRatio)
+        best = scores.argmax(axis=1)
+        best_scores = scores.max(axis=1)
+        for v, q, b, sc in zip(todo, queries, best, best_scores):
+            mapping[v] = CANONICAL_MEDS[b] if sc >= 80 else q
+
+    return col.map(mapping)
+
+
 # =====================================================
 # 5. File Loader (CSV, Excel, JSON)
 # =====================================================
@@ -154,34 +250,58 @@ def load_file(path: str) -> pd.DataFrame:
         raise ValueError(f"Unsupported file format: {ext}")
 
 
+# CSV: 250k rows per chunk keeps memory flat without too many round-trips.
+# Excel/JSON have no cheap streaming reader here, so they come as one chunk.
+CSV_CHUNKSIZE = 250_000
+
+def iter_chunks(path: str, chunksize: int = CSV_CHUNKSIZE):
+    if os.path.splitext(path)[1].lower() == ".csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        yield load_file(path)
+
+
 # =====================================================
 # 6. Full Pipeline: Normalize and Insert into Staging
 # =====================================================
 def normalize_and_load(file_path: str, source_hospital: str):
-    df = load_file(file_path)
-    print("[RAW DATA]")
-    print(df.head())
-
-    df = map_columns(df)
-
-    # احذف أي duplicate columns نهائياً
-    df = df.loc[:, ~df.columns.duplicated()]
-
-    if "date_of_birth" in df.columns:
-        df["date_of_birth"] = df["date_of_birth"].apply(normalize_date)
-    if "medication" in df.columns:
-        df["medication"] = df["medication"].apply(normalize_medication)
-
-    print("\n[NORMALIZED DATA]")
-    print(df.head())
-
+    mapping = None
     engine = get_engine()
     with engine.begin() as conn:
-        for _, row in df.iterrows():
-            conn.execute(text("""
-                INSERT INTO staging_incoming_data (data, status, created_at)
-                VALUES (:data, 'pending', NOW())
-            """), {"data": row.to_json(force_ascii=False)})
+        with conn.connection.cursor() as cur:
+            for df in iter_chunks(file_path):
+                first = mapping is None
+                if first:
+                    print("[RAW DATA]")
+                    print(df.head())
+                    # نفس الأعمدة في كل chunk، فالـ mapping يتحسب مرة وحدة
+                    mapping = build_column_mapping(df.columns)
+
+                df = df.rename(columns=mapping)
+
+                # احذف أي duplicate columns نهائياً
+                df = df.loc[:, ~df.columns.duplicated()]
+
+                if "date_of_birth" in df.columns:
+                    df["date_of_birth"] = normalize_date_series(df["date_of_birth"])
+                if "medication" in df.columns:
+                    df["medication"] = normalize_medication_series(df["medication"])
+
+                if first:
+                    print("\n[NORMALIZED DATA]")
+                    print(df.head())
+
+                # نفس JSON اللي كان row.to_json يطلعه، بس لكل الصفوف مرة وحدة
+                # (JSON lines: أي newline داخل القيم يكون escaped)
+                rows = [
+                    (line,)
+                    for line in df.to_json(orient="records", lines=True, force_ascii=False).split("\n")
+                    if line
+                ]
+                execute_values(cur, """
+                    INSERT INTO staging_incoming_data (data, status, created_at)
+                    VALUES %s
+                """, rows, template="(%s, 'pending', NOW())", page_size=1000)
 
 
 # =====================================================
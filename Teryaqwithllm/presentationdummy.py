@@ -1,4 +1,6 @@
 import os
+import io
+import csv
 import time
 import uuid
 import random
@@ -7,6 +9,8 @@ import psycopg2
 import json
 from faker import Faker
 import math
+import numpy as np
+from itertools import islice
 from urllib.request import urlopen
 from urllib.parse import quote
 
@@ -48,6 +52,10 @@ if conn is None:
 
 cur = conn.cursor()
 
+# The whole seed (truncate included) is one transaction committed at the end;
+# its WAL flush doesn't need to wait on disk.
+cur.execute("SET LOCAL synchronous_commit = OFF")
+
 # ==========================================================
 # 0) CLEAR ALL EXISTING DATA
 # ==========================================================
@@ -77,8 +85,6 @@ TRUNCATE TABLE
 RESTART IDENTITY CASCADE;
 """)
 
-conn.commit()
-
 # ==========================================================
 # 2) Wait for ALL Required Tables
 # ==========================================================
@@ -104,19 +110,46 @@ REQUIRED_TABLES = [
     "delivery_event",
 ]
 
-def table_exists(table_name: str) -> bool:
-    cur.execute("SELECT to_regclass(%s);", (table_name,))
-    return cur.fetchone()[0] is not None
+# Tables never disappear mid-seed, so once seen they're not re-checked.
+_known_present = set()
+
+def missing_tables(table_names) -> list:
+    """
+    Names that don't resolve yet, checked in ONE round-trip (to_regclass over the list).
+    Keep "\"Order\"" quoted: to_regclass folds unquoted names to lowercase.
+    """
+    todo = [t for t in table_names if t not in _known_present]
+    if not todo:
+        return []
+    cur.execute(
+        """
+        SELECT t.name, to_regclass(t.name) IS NOT NULL
+        FROM unnest(%s::text[]) WITH ORDINALITY AS t(name, pos)
+        ORDER BY t.pos;
+        """,
+        (todo,),
+    )
+    missing = []
+    for name, ok in cur.fetchall():
+        if ok:
+            _known_present.add(name)
+        else:
+            missing.append(name)
+    return missing
 
 print("⏳ Waiting for all required tables to be created...")
 
-for attempt in range(40):
-    missing = [t for t in REQUIRED_TABLES if not table_exists(t)]
+# Back off from 0.1s up to 3s: a ready DB is noticed almost immediately,
+# a slow one isn't polled every few hundred ms.
+delay = 0.1
+for attempt in range(60):
+    missing = missing_tables(REQUIRED_TABLES)
     if not missing:
         print("✅ All tables exist! Continuing with seeding...")
         break
     print(f"⏳ Still waiting... Missing tables: {missing}")
-    time.sleep(2)
+    time.sleep(delay)
+    delay = min(delay * 1.5, 3.0)
 else:
     raise RuntimeError(f"❌ Timed out waiting for tables: {missing}")
 
@@ -126,9 +159,38 @@ else:
 
 fake = Faker("en_US")
 random.seed(42)
+_rng = np.random.default_rng(42)
+
+# UUIDs are handed out from a pool filled 4096 at a time by one os.urandom
+# read, instead of one OS RNG call per uuid4(). They are UUIDv7: a 48-bit ms
+# timestamp, then a 12-bit sequence (the batch position) and 62 random bits,
+# so ids come out in ascending order and PK inserts append to the index.
+_UUID_BATCH = 4096
+_uuid_pool: list[str] = []
+_uuid_last_ms = 0
+
+def bulk_uuids(n: int) -> list[str]:
+    global _uuid_last_ms
+    assert n <= 4096, "the 12-bit sequence field holds at most 4096 ids per ms"
+    ts = _uuid_last_ms = max(time.time_ns() // 1_000_000, _uuid_last_ms + 1)
+    raw = os.urandom(8 * n)
+    head = (ts << 80) | (0x7 << 76)
+    ids = [
+        str(uuid.UUID(int=head | (seq << 64) | (0b10 << 62)
+                      | (int.from_bytes(raw[8 * seq:8 * seq + 8], "big") & ((1 << 62) - 1))))
+        for seq in range(n)
+    ]
+    ids.reverse()  # gen_uuid pops from the end
+    return ids
 
 def gen_uuid() -> str:
-    return str(uuid.uuid4())
+    if not _uuid_pool:
+        _uuid_pool.extend(bulk_uuids(_UUID_BATCH))
+    return _uuid_pool.pop()
+
+def gen_uuid_hex() -> str:
+    """Dash-less hex of a pooled UUIDv7, used for the firebase uids."""
+    return gen_uuid().replace("-", "")
 
 def phone_sa() -> str:
     return f"+9665{random.randint(10000000, 99999999)}"
@@ -147,12 +209,18 @@ generated_national_ids = {
     MAIN_DRIVER_NID,
 }
 
+# National IDs come from distinct samples of the 10-digit space, drawn in
+# batches; the reserved MAIN IDs are filtered out once per batch.
+_NID_BATCH = 1024
+_nid_pool: list[str] = []
+
 def gen_national_id_10() -> str:
-    while True:
-        nid = f"{random.randint(10**9, (10**10) - 1)}"
-        if nid not in generated_national_ids:
-            generated_national_ids.add(nid)
-            return nid
+    while not _nid_pool:
+        batch = (str(n) for n in random.sample(range(10**9, 10**10), _NID_BATCH))
+        _nid_pool.extend(n for n in batch if n not in generated_national_ids)
+    nid = _nid_pool.pop()
+    generated_national_ids.add(nid)
+    return nid
 
 ARABIC_NAMES = [
     "Mohammed", "Ahmad", "Fahad", "Nasser",
@@ -165,8 +233,8 @@ ARABIC_LAST = [
     "Al-Shehri", "Al-Dosari",
 ]
 
-def random_arabic_full_name() -> str:
-    return f"{random.choice(ARABIC_NAMES)} {random.choice(ARABIC_LAST)}"
+def random_arabic_full_names(k: int) -> list[str]:
+    return [f"{a} {b}" for a, b in zip(random.choices(ARABIC_NAMES, k=k), random.choices(ARABIC_LAST, k=k))]
 
 # -----------------------------
 # Presentation Medication Catalog (removed the word "demo")
@@ -254,11 +322,27 @@ MED_CATALOG = [
     ),
 ]
 
+def med_description(name: str, exc_min: int, exc_max: int, exert_min: int) -> str:
+    return safe_str(f"{name} | Storage {exc_min}–{exc_max}°C | Max excursion {exert_min} min", 250)
+
+# Catalog strings are fixed per spec, so build them once here.
+for _spec in MED_CATALOG:
+    _spec["desc"] = med_description(_spec["name"], _spec["exc_min"], _spec["exc_max"], _spec["exert_min"])
+    _spec["exert_interval"] = f"{int(_spec['exert_min'])} minutes"
+
 MEDICATION_NAME_POOL = [
     "Novolog FlexPen", "Mixtard 30", "Levemir FlexPen", "Toujeo SoloStar",
     "Glucophage", "Januvia", "Victoza", "Fiasp", "Ryzodeg 70/30",
 ]
 
+# Unique (name, catalog spec or None) picks for the non-MAIN hospitals: every
+# base name plus numbered variants, so a plain sample never repeats a name.
+_NAME_VARIANTS = ("", " (2)", " (3)", " (4)")
+HOSPITAL_MED_POOL = (
+    [(spec["name"] + v, spec) for spec in MED_CATALOG for v in _NAME_VARIANTS]
+    + [(name + v, None) for name in MEDICATION_NAME_POOL for v in _NAME_VARIANTS]
+)
+
 # Presentation map points
 BASE_LAT = 25.902679
 BASE_LON = 45.381901
@@ -270,8 +354,8 @@ POINTS = {
     "D": (BASE_LAT - 0.0070, BASE_LON - 0.0035),
 }
 
-def random_address() -> str:
-    return f"{random.randint(10,999)} Street, Riyadh, SA"
+def random_addresses(k: int) -> list[str]:
+    return [f"{n} Street, Riyadh, SA" for n in random.choices(range(10, 1000), k=k)]
 
 def random_coords(radius_km: float = 3.0) -> tuple[float, float]:
     d = radius_km / 111.0
@@ -279,6 +363,12 @@ def random_coords(radius_km: float = 3.0) -> tuple[float, float]:
     lon = BASE_LON + random.uniform(-d, d)
     return round(lat, 6), round(lon, 6)
 
+def random_coords_batch(n: int, radius_km: float = 3.0) -> list[tuple[float, float]]:
+    """n random_coords() points drawn in one NumPy call."""
+    d = radius_km / 111.0
+    pts = np.round(_rng.uniform(-d, d, size=(n, 2)) + (BASE_LAT, BASE_LON), 6)
+    return [tuple(p) for p in pts.tolist()]
+
 # ==========================================================
 # 4) Containers (reduced bulk)
 # ==========================================================
@@ -308,6 +398,39 @@ main_prescription_ids = []
 orders_meta = {}
 otp_info = {}
 
+# Seed rows are buffered per table and written by flush_all() at section
+# boundaries. Hospital/Patient/Driver and Medication/Hospital_Medication/
+# Prescription each go out as one chained-CTE insert (insert_chain).
+hospital_rows = []
+patient_rows = []
+driver_rows = []
+medication_rows = []
+hospital_med_rows = []
+prescription_rows = []
+
+# Per-order tables, written by flush_all() with COPY instead. COPY takes no
+# expressions, so relative times are resolved against SEED_NOW: the seed
+# transaction's NOW() read once from the server, not the client clock.
+# Leaf tables (everything but Dashboard and "Order") leave their id out and
+# take the column DEFAULT.
+dashboard_rows = []
+order_rows = []
+notification_rows = []
+temperature_rows = []
+gps_rows = []
+delivery_time_rows = []
+stability_time_rows = []
+report_rows = []
+delivery_event_rows = []
+cur.execute("SELECT LOCALTIMESTAMP")
+SEED_NOW = cur.fetchone()[0]
+NOW_ISO = SEED_NOW.isoformat()
+
+# Stability window (minutes) per seeded medication / prescription, so orders
+# don't have to read it back from the DB.
+MED_EXERT_MIN = {}
+PRESC_STABILITY_MIN = {}
+
 def pick_priority() -> str:
     r = random.random()
     if r < 0.6:
@@ -331,13 +454,21 @@ def compute_delivery_minutes(scenario: str, stability_minutes: int) -> int:
         return random.randint(stability_minutes + 10, stability_minutes + 120)
     return random.randint(stability_minutes + 20, stability_minutes + 150)
 
-def random_temp_value(scenario: str) -> float:
-    base = random.uniform(2.0, 7.8)
-    if scenario in ["excursion", "both"] and random.random() < 0.7:
-        return round(random.uniform(8.6, 14.5), 2)  # biased out-of-range for presentation
-    if scenario == "near_limit" and random.random() < 0.8:
-        return round(random.uniform(7.9, 8.4), 2)   # close to max range (2–8)
-    return round(base, 2)
+def random_temp_values(scenario: str, k: int) -> list[float]:
+    """k temperature readings for a scenario, drawn as one NumPy batch."""
+    temps = _rng.uniform(2.0, 7.8, size=k)
+    if scenario in ["excursion", "both"]:
+        out = _rng.random(k) < 0.7
+        temps[out] = _rng.uniform(8.6, 14.5, size=int(out.sum()))  # biased out-of-range for presentation
+    elif scenario == "near_limit":
+        near = _rng.random(k) < 0.8
+        temps[near] = _rng.uniform(7.9, 8.4, size=int(near.sum()))  # close to max range (2–8)
+    return np.round(temps, 2).tolist()
+
+def minutes_ago_batch(k: int, lo: int = 5, hi: int = 180) -> list[datetime]:
+    """k timestamps SEED_NOW - randint(lo, hi) minutes, in one NumPy draw."""
+    mins = _rng.integers(lo, hi + 1, size=k).astype("timedelta64[m]")
+    return (np.datetime64(SEED_NOW, "us") - mins).tolist()
 
 RIYADH_HOSPITALS = [
     ("King Fahad Medical City", "King Fahad Road, Riyadh", 25.907388, 45.380306),
@@ -352,6 +483,8 @@ RIYADH_HOSPITALS = [
 def get_med_stability_minutes_from_prescription(prescription_id: str) -> int:
     if not prescription_id:
         return 0
+    if prescription_id in PRESC_STABILITY_MIN:
+        return PRESC_STABILITY_MIN[prescription_id]
     cur.execute(
         """
         SELECT m.max_time_exertion
@@ -388,55 +521,147 @@ def insert_medication_and_link(
     exert_min: int,
     return_fridge: bool,
     actions: str,
+    description: str | None = None,
+    exert_interval: str | None = None,
 ) -> str:
     medication_id = gen_uuid()
-    max_time_exertion_val = timedelta(minutes=int(exert_min))
+    if description is None:
+        description = med_description(med_name, exc_min, exc_max, exert_min)
+    if exert_interval is None:
+        exert_interval = f"{int(exert_min)} minutes"
 
-    cur.execute(
-        """
-        INSERT INTO Medication (
-            medication_id, name, description, information_source,
-            exp_date, max_time_exertion,
-            min_temp_range_excursion, max_temp_range_excursion,
-            return_to_the_fridge, max_time_safe_use,
-            additional_actions_detail, risk_level
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    medication_rows.append(
         (
             medication_id,
             med_name,
-            safe_str(f"{med_name} | Storage {exc_min}–{exc_max}°C | Max excursion {exert_min} min", 250),
+            description,
             "MOH",
             datetime.now() + timedelta(days=random.randint(180, 720)),
-            max_time_exertion_val,
+            exert_interval,
             exc_min, exc_max,
             bool(return_fridge),
             True,
             safe_str(actions, 200),
             risk,
-        ),
-    )
-
-    cur.execute(
-        """
-        INSERT INTO Hospital_Medication (hospital_id, medication_id, availability)
-        VALUES (%s,%s,%s)
-        """,
-        (hospital_id, medication_id, True),
+        )
     )
+    hospital_med_rows.append((hospital_id, medication_id, True))
+    MED_EXERT_MIN[medication_id] = int(exert_min)
 
     return medication_id
 
+def copy_rows(table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    # Every seeded table was truncated earlier in this same transaction, so
+    # the rows can be loaded already frozen (no hint-bit / vacuum-freeze pass
+    # over them later).
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV, FREEZE)", buf)
+
+HOSPITAL_COLUMNS = (
+    "hospital_id", "firebase_uid", "national_id", "name", "address",
+    "email", "phone_number", "lat", "lon", "status",
+)
+PATIENT_COLUMNS = (
+    "patient_id", "firebase_uid", "national_id", "hospital_id",
+    "name", "address", "email", "phone_number", "gender", "birth_date",
+    "lat", "lon", "preferred_delivery_type", "status",
+)
+DRIVER_COLUMNS = (
+    "driver_id", "firebase_uid", "national_id", "hospital_id",
+    "name", "email", "phone_number", "address",
+    "lat", "lon", "status",
+)
+MEDICATION_COLUMNS = (
+    "medication_id", "name", "description", "information_source",
+    "exp_date", "max_time_exertion",
+    "min_temp_range_excursion", "max_temp_range_excursion",
+    "return_to_the_fridge", "max_time_safe_use",
+    "additional_actions_detail", "risk_level",
+)
+HOSPITAL_MED_COLUMNS = ("hospital_id", "medication_id", "availability")
+PRESCRIPTION_COLUMNS = (
+    "prescription_id", "hospital_id", "medication_id", "patient_id",
+    "expiration_date", "reorder_threshold", "instructions", "prescribing_doctor", "status",
+)
+
+def _values_sql(rows: list[tuple]) -> str:
+    template = "(" + ",".join(["%s"] * len(rows[0])) + ")"
+    return ",".join(cur.mogrify(template, r).decode() for r in rows)
+
+def insert_chain(parts) -> None:
+    """
+    Write several buffers, given as (table, columns, rows) in FK order, with
+    ONE statement: every insert but the last runs as a data-modifying CTE.
+    Ids are generated client-side, so nothing needs to flow back through
+    RETURNING; FK checks run at the end of the statement, after all inserts.
+    Buffers are cleared once written.
+    """
+    parts = [(table, columns, rows) for table, columns, rows in parts if rows]
+    if not parts:
+        return
+    inserts = [
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {_values_sql(rows)}"
+        for table, columns, rows in parts
+    ]
+    ctes = ", ".join(f"w{i} AS ({sql})" for i, sql in enumerate(inserts[:-1]))
+    cur.execute((f"WITH {ctes} " if ctes else "") + inserts[-1])
+    for _, _, rows in parts:
+        rows.clear()
+
+def flush_people():
+    """Write buffered Hospital / Patient / Driver rows in one statement."""
+    insert_chain((
+        ("Hospital", HOSPITAL_COLUMNS, hospital_rows),
+        ("Patient", PATIENT_COLUMNS, patient_rows),
+        ("Driver", DRIVER_COLUMNS, driver_rows),
+    ))
+
+def insert_catalog_cte():
+    """Write buffered Medication / Hospital_Medication / Prescription rows in one statement."""
+    insert_chain((
+        ("Medication", MEDICATION_COLUMNS, medication_rows),
+        ("Hospital_Medication", HOSPITAL_MED_COLUMNS, hospital_med_rows),
+        ("Prescription", PRESCRIPTION_COLUMNS, prescription_rows),
+    ))
+
+def flush_all():
+    """Write every buffered seed row, parents before children (FK order)."""
+    flush_people()
+    insert_catalog_cte()
+
+    order_copies = (
+        ("Dashboard", ("dashboard_id",), dashboard_rows),
+        ('"Order"', (
+            "order_id", "driver_id", "patient_id", "hospital_id", "prescription_id",
+            "dashboard_id", "description", "notes",
+            "priority_level", "order_type", "patient_delivery_time",
+            "ml_delivery_type", "OTP", "status",
+            "created_at", "delivered_at",
+        ), order_rows),
+        ("Temperature", ("dashboard_id", "temp_value", "recorded_at"), temperature_rows),
+        ("GPS", ("dashboard_id", "latitude", "longitude", "recorded_at"), gps_rows),
+        ("estimated_delivery_time", ("dashboard_id", "delay_time", "recorded_at"), delivery_time_rows),
+        ("estimated_stability_time", ("dashboard_id", "stability_time", "recorded_at"), stability_time_rows),
+        ("Notification", (
+            "order_id", "notification_type",
+            "notification_content", "notification_time",
+        ), notification_rows),
+        ("Report", ("order_id", "report_type", "report_content"), report_rows),
+        ("delivery_event", (
+            "order_id", "event_status", "event_message", "duration",
+            "remaining_stability", "condition", "lat", "lon", "eta", "recorded_at",
+        ), delivery_event_rows),
+    )
+    for table, columns, rows in order_copies:
+        if rows:
+            copy_rows(table, columns, rows)
+            rows.clear()
+
 def insert_notification(order_id: str, ntype: str, content: str, minutes_ago: int):
-    cur.execute(
-        """
-        INSERT INTO Notification (
-            notification_id, order_id, notification_type,
-            notification_content, notification_time
-        ) VALUES (%s,%s,%s,%s, NOW() - INTERVAL %s)
-        """,
-        (gen_uuid(), order_id, ntype, content, f"'{int(minutes_ago)} minutes'"),
+    notification_rows.append(
+        (order_id, ntype, content, SEED_NOW - timedelta(minutes=int(minutes_ago)))
     )
 
 # ==========================================================
@@ -448,6 +673,14 @@ print("🏥 Seeding Hospitals, Patients, Drivers, Medications, Prescriptions ...
 # Ensure we always include KFMC as main hospital
 chosen_hospitals = RIYADH_HOSPITALS[:NUM_HOSPITALS]
 
+# Text fields for the whole section, rendered up front and consumed in order.
+_n_people = len(chosen_hospitals) * (PATIENTS_PER_HOSPITAL + DRIVERS_PER_HOSPITAL)
+_n_meds = len(chosen_hospitals) * 6
+seed_emails = iter([fake.email() for _ in range(len(chosen_hospitals) + _n_people)])
+seed_names = iter(random_arabic_full_names(_n_people + _n_meds))
+seed_addresses = iter(random_addresses(_n_people))
+seed_med_texts = iter([safe_str(fake.text(120), 200) for _ in range(_n_meds)])
+
 for name, addr, h_lat, h_lon in chosen_hospitals:
     hospital_id = gen_uuid()
     hospital_ids.append(hospital_id)
@@ -459,56 +692,43 @@ for name, addr, h_lat, h_lon in chosen_hospitals:
         firebase_uid = "HOSP_FIXED_MAIN_UID"
     else:
         national_id = gen_national_id_10()
-        firebase_uid = "HOSP_" + uuid.uuid4().hex
+        firebase_uid = "HOSP_" + gen_uuid_hex()
 
-    cur.execute(
-        """
-        INSERT INTO Hospital (
-            hospital_id, firebase_uid, national_id, name, address,
-            email, phone_number, lat, lon, status
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    hospital_rows.append(
         (
             hospital_id,
             firebase_uid,
             national_id,
             name,
             addr,
-            fake.email(),
+            next(seed_emails),
             phone_sa(),
             h_lat,
             h_lon,
             "active",
-        ),
+        )
     )
 
+    # one coordinate draw for all of this hospital's patients and drivers
+    people_coords = random_coords_batch(PATIENTS_PER_HOSPITAL + DRIVERS_PER_HOSPITAL)
+
     # Patients (minimal)
     patients_by_hospital[hospital_id] = []
-    for _ in range(PATIENTS_PER_HOSPITAL):
+    for plat, plon in people_coords[:PATIENTS_PER_HOSPITAL]:
         patient_id = gen_uuid()
-        p_firebase_uid = "PAT_" + uuid.uuid4().hex
+        p_firebase_uid = "PAT_" + gen_uuid_hex()
         p_national_id = gen_national_id_10()
-        plat, plon = random_coords()
-        pname = random_arabic_full_name()
+        pname = next(seed_names)
         birth_date = fake.date_of_birth(minimum_age=1, maximum_age=90)
 
-        cur.execute(
-            """
-            INSERT INTO Patient (
-                patient_id, firebase_uid, national_id, hospital_id,
-                name, address, email, phone_number, gender, birth_date,
-                lat, lon, preferred_delivery_type, status
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        patient_rows.append(
             (
                 patient_id, p_firebase_uid, p_national_id, hospital_id,
-                pname, random_address(), fake.email(), phone_sa(),
+                pname, next(seed_addresses), next(seed_emails), phone_sa(),
                 random.choice(["Male", "Female"]),
                 birth_date, plat, plon,
                 "delivery", "active",
-            ),
+            )
         )
 
         patients_by_hospital[hospital_id].append(patient_id)
@@ -516,27 +736,18 @@ for name, addr, h_lat, h_lon in chosen_hospitals:
 
     # Drivers (minimal)
     drivers_by_hospital[hospital_id] = []
-    for _ in range(DRIVERS_PER_HOSPITAL):
+    for dlat, dlon in people_coords[PATIENTS_PER_HOSPITAL:]:
         driver_id = gen_uuid()
-        d_firebase_uid = "DRV_" + uuid.uuid4().hex
+        d_firebase_uid = "DRV_" + gen_uuid_hex()
         d_national_id = gen_national_id_10()
-        dlat, dlon = random_coords()
-        dname = random_arabic_full_name()
-
-        cur.execute(
-            """
-            INSERT INTO Driver (
-                driver_id, firebase_uid, national_id, hospital_id,
-                name, email, phone_number, address,
-                lat, lon, status
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        dname = next(seed_names)
+
+        driver_rows.append(
             (
                 driver_id, d_firebase_uid, d_national_id, hospital_id,
-                dname, fake.email(), phone_sa(), random_address(),
+                dname, next(seed_emails), phone_sa(), next(seed_addresses),
                 dlat, dlon, "active",
-            ),
+            )
         )
 
         drivers_by_hospital[hospital_id].append(driver_id)
@@ -545,15 +756,14 @@ for name, addr, h_lat, h_lon in chosen_hospitals:
 
     # For non-main hospitals: light medication + prescriptions
     if hospital_id != main_hospital_id:
-        used_names = set()
-        for _ in range(6):
-            if random.random() < 0.6:
-                spec = random.choice(MED_CATALOG)
-                med_name = spec["name"]
-                if med_name in used_names:
-                    med_name = f"{med_name} ({random.randint(2, 99)})"
-                used_names.add(med_name)
-
+        # all per-prescription draws for this hospital in one call each
+        presc_patients = random.choices(patients_by_hospital[hospital_id], k=6)
+        presc_thresholds = random.choices(range(1, 6), k=6)
+        presc_expiry_days = random.choices(range(90, 366), k=6)
+        for (med_name, spec), patient_id, threshold, expiry_days in zip(
+            random.sample(HOSPITAL_MED_POOL, 6), presc_patients, presc_thresholds, presc_expiry_days
+        ):
+            if spec is not None:
                 medication_id = insert_medication_and_link(
                     hospital_id=hospital_id,
                     med_name=med_name,
@@ -563,13 +773,9 @@ for name, addr, h_lat, h_lon in chosen_hospitals:
                     exert_min=int(spec["exert_min"]),
                     return_fridge=bool(spec["return_fridge"]),
                     actions=spec["actions"],
+                    exert_interval=spec["exert_interval"],
                 )
             else:
-                med_name = random.choice(MEDICATION_NAME_POOL)
-                if med_name in used_names:
-                    med_name = f"{med_name} ({random.randint(2, 99)})"
-                used_names.add(med_name)
-
                 temp_sensitive = random.random() < 0.5
                 exc_min, exc_max = (2, 8) if temp_sensitive else (15, 30)
                 exert_min = random.randint(120, 720)
@@ -583,38 +789,33 @@ for name, addr, h_lat, h_lon in chosen_hospitals:
                     exc_max=int(exc_max),
                     exert_min=int(exert_min),
                     return_fridge=bool(temp_sensitive),
-                    actions=safe_str(fake.text(120), 200),
+                    actions=next(seed_med_texts),
                 )
 
             # 1 prescription per med (minimal)
             presc_id = gen_uuid()
-            patient_id = random.choice(patients_by_hospital[hospital_id])
-            cur.execute(
-                """
-                INSERT INTO Prescription (
-                    prescription_id, hospital_id, medication_id, patient_id,
-                    expiration_date, reorder_threshold, instructions, prescribing_doctor, status
-                )
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                """,
+            prescription_rows.append(
                 (
                     presc_id,
                     hospital_id,
                     medication_id,
                     patient_id,
-                    datetime.now() + timedelta(days=random.randint(90, 365)),
-                    random.randint(1, 5),
+                    datetime.now() + timedelta(days=expiry_days),
+                    threshold,
                     "Use as prescribed.",
-                    random_arabic_full_name(),
+                    next(seed_names),
                     "active",
-                ),
+                )
             )
+            PRESC_STABILITY_MIN[presc_id] = MED_EXERT_MIN[medication_id]
             prescriptions.append({
                 "prescription_id": presc_id,
                 "hospital_id": hospital_id,
                 "patient_id": patient_id,
             })
 
+flush_all()
+
 # ==========================================================
 # 5.5) MAIN presentation hospital/patient/driver + curated meds
 # ==========================================================
@@ -625,15 +826,7 @@ print("🎯 Creating MAIN presentation patient/driver ...")
 a_lat, a_lon = POINTS["A"]
 main_patient_id = gen_uuid()
 
-cur.execute(
-    """
-    INSERT INTO Patient (
-        patient_id, firebase_uid, national_id, hospital_id,
-        name, address, email, phone_number, gender, birth_date,
-        lat, lon, preferred_delivery_type, status
-    )
-    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    """,
+patient_rows.append(
     (
         main_patient_id,
         "PAT_FIXED_MAIN_UID",
@@ -647,22 +840,14 @@ cur.execute(
         datetime(1999, 1, 1),
         a_lat, a_lon,
         "delivery", "active",
-    ),
+    )
 )
 
 patient_info[main_patient_id] = {"name": "Mohammed Al-Qahtani", "national_id": MAIN_PATIENT_NID}
 
 # Main driver
 main_driver_id = gen_uuid()
-cur.execute(
-    """
-    INSERT INTO Driver (
-        driver_id, firebase_uid, national_id, hospital_id,
-        name, email, phone_number, address,
-        lat, lon, status
-    )
-    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    """,
+driver_rows.append(
     (
         main_driver_id,
         "DRV_FIXED_MAIN_UID",
@@ -674,7 +859,7 @@ cur.execute(
         "Driver starting point",
         BASE_LAT, BASE_LON,
         "active",
-    ),
+    )
 )
 driver_info[main_driver_id] = {"name": "Ahmad Al-Harbi", "national_id": MAIN_DRIVER_NID}
 
@@ -691,6 +876,8 @@ for spec in main_catalog:
         exert_min=int(spec["exert_min"]),
         return_fridge=bool(spec["return_fridge"]),
         actions=spec["actions"],
+        description=spec["desc"],
+        exert_interval=spec["exert_interval"],
     )
     main_medication_ids.append(med_id)
     main_med_name_to_id[spec["name"]] = med_id
@@ -713,6 +900,9 @@ def build_instructions(med_name: str) -> str:
         return "Keep refrigerated. Administer per specialist instruction."
     return "Use as prescribed."
 
+# only the curated MAIN names reach build_instructions, so resolve them once
+INSTR_CACHE = {name: build_instructions(name) for name in main_med_name_to_id}
+
 # Prescriptions for MAIN patient (some with 0 days left)
 print("📄 Creating MAIN patient prescriptions (including 0 days left)...")
 
@@ -728,11 +918,13 @@ all_main_med_items = list(main_med_name_to_id.items())
 if not all_main_med_items:
     raise RuntimeError("No curated medications found for MAIN hospital; cannot create prescriptions.")
 
-for i in range(NUM_MAIN_PRESCRIPTIONS):
-    presc_id = gen_uuid()
+# pick medications with repeats so you can have > 10 prescriptions
+main_med_picks = random.choices(all_main_med_items, k=NUM_MAIN_PRESCRIPTIONS)
+main_thresholds = random.choices(range(1, 7), k=NUM_MAIN_PRESCRIPTIONS)
+main_doctors = random.choices(DOCTORS, k=NUM_MAIN_PRESCRIPTIONS)
 
-    # pick a medication (allows repeats so you can have > 10 prescriptions)
-    med_name, med_id = random.choice(all_main_med_items)
+for i, (med_name, med_id) in enumerate(main_med_picks):
+    presc_id = gen_uuid()
 
     # first K prescriptions expire today => "0 days left"
     if i < ZERO_DAYS_LEFT_COUNT:
@@ -742,32 +934,26 @@ for i in range(NUM_MAIN_PRESCRIPTIONS):
 
     presc_status = "active"
 
-    cur.execute(
-        """
-        INSERT INTO Prescription (
-            prescription_id, hospital_id, medication_id, patient_id,
-            expiration_date, reorder_threshold, instructions, prescribing_doctor, status
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    prescription_rows.append(
         (
             presc_id,
             main_hospital_id,
             med_id,
             main_patient_id,
             exp,
-            random.randint(1, 6),
-            build_instructions(med_name),
-            random.choice(DOCTORS),
+            main_thresholds[i],
+            INSTR_CACHE[med_name],
+            main_doctors[i],
             presc_status,
-        ),
+        )
     )
 
+    PRESC_STABILITY_MIN[presc_id] = MED_EXERT_MIN[med_id]
     main_prescription_ids.append(presc_id)
 
-# hard verification (same transaction)
-cur.execute("SELECT COUNT(*) FROM prescription WHERE patient_id = %s", (main_patient_id,))
-print("✅ MAIN prescriptions inserted for main_patient_id:", cur.fetchone()[0])
+flush_all()
+
+print("✅ MAIN prescriptions inserted for main_patient_id:", len(main_prescription_ids))
 
 
 
@@ -887,10 +1073,33 @@ def calc_main_eta_minutes(*, driver_id: str, patient_id: str | None, hospital_id
 
     return max(1, int(eta))
 
+# ==========================================================
+# Prepared per-row INSERTs (parsed and planned once per session)
+# ==========================================================
+
+PREPARED_INSERTS = {
+    "ins_request": """
+        INSERT INTO Requests (hospital_id, order_id, status, request_content)
+        VALUES ($1,$2,$3,$4)
+    """,
+}
+
+for _name, _sql in PREPARED_INSERTS.items():
+    cur.execute(f"PREPARE {_name} AS {_sql}")
+
+def execute_prepared(name: str, params: tuple) -> None:
+    cur.execute(f"EXECUTE {name} ({','.join(['%s'] * len(params))})", params)
+
 # ==========================================================
 # 6) CREATE ORDER FUNCTION (clean descriptions + better notifications)
 # ==========================================================
 
+# removed "Demo"
+ORDER_DESCRIPTIONS = {
+    s: f"Order ({s})"
+    for s in ("pending", "accepted", "on_delivery", "on_route", "delivered", "delivery_failed", "rejected")
+}
+
 def create_order(
     *, hospital_id, patient_id, driver_id, prescription_id,
     status, scenario, created_at,
@@ -913,31 +1122,22 @@ def create_order(
     order_id = gen_uuid()
     otp = random.randint(1000, 9999)
 
-    cur.execute("INSERT INTO Dashboard (dashboard_id) VALUES (%s)", (dashboard_id,))
+    dashboard_rows.append((dashboard_id,))
 
-    description = f"Order ({status})"  # removed "Demo"
-    notes = f"scenario={scenario}"
+    description = ORDER_DESCRIPTIONS.get(status) or f"Order ({status})"
+    notes = "scenario=" + scenario
     if is_main:
         notes += " [MAIN]"
     if notes_suffix:
-        notes += f" | {notes_suffix}"
+        notes += " | " + notes_suffix
 
-    cur.execute(
-        """
-        INSERT INTO "Order" (
-            order_id, driver_id, patient_id, hospital_id, prescription_id,
-            dashboard_id, description, notes,
-            priority_level, order_type, patient_delivery_time,
-            ml_delivery_type, OTP, status,
-            created_at, delivered_at
-        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        """,
+    order_rows.append(
         (
             order_id, driver_id, patient_id, hospital_id, prescription_id,
             dashboard_id, description, notes, priority,
             order_type, patient_delivery_time, ml_delivery_type,
             otp, status, created_at, delivered_at,
-        ),
+        )
     )
 
     orders_meta[order_id] = {
@@ -957,45 +1157,21 @@ def create_order(
         "driver_id": driver_id,
     }
 
-    # Temperature & GPS series
-    for _ in range(random.randint(10, 16)):
-        minutes_ago = random.randint(5, 180)
-        temp_val = random_temp_value(scenario)
-        cur.execute(
-            """
-            INSERT INTO Temperature (temperature_id, dashboard_id, temp_value, recorded_at)
-            VALUES (%s,%s,%s, NOW() - INTERVAL %s)
-            """,
-            (gen_uuid(), dashboard_id, float(temp_val), f"'{int(minutes_ago)} minutes'"),
-        )
-
-    for _ in range(random.randint(10, 16)):
-        lat, lon = random_coords()
-        minutes_ago = random.randint(5, 180)
-        cur.execute(
-            """
-            INSERT INTO GPS (gps_id, dashboard_id, latitude, longitude, recorded_at)
-            VALUES (%s,%s,%s,%s, NOW() - INTERVAL %s)
-            """,
-            (gen_uuid(), dashboard_id, lat, lon, f"'{int(minutes_ago)} minutes'"),
-        )
-
-    cur.execute(
-        """
-        INSERT INTO estimated_delivery_time (estimated_delivery_id, dashboard_id, delay_time, recorded_at)
-        VALUES (%s,%s,%s,NOW())
-        """,
-        (gen_uuid(), dashboard_id, timedelta(minutes=delivery)),
+    # Temperature & GPS series (values and timestamps drawn as NumPy batches)
+    k = int(_rng.integers(10, 17))
+    temperature_rows.extend(
+        (dashboard_id, temp, at)
+        for temp, at in zip(random_temp_values(scenario, k), minutes_ago_batch(k))
     )
-
-    cur.execute(
-        """
-        INSERT INTO estimated_stability_time (estimated_stability_id, dashboard_id, stability_time, recorded_at)
-        VALUES (%s,%s,%s,NOW())
-        """,
-        (gen_uuid(), dashboard_id, timedelta(minutes=stability)),
+    k = int(_rng.integers(10, 17))
+    gps_rows.extend(
+        (dashboard_id, lat, lon, at)
+        for (lat, lon), at in zip(random_coords_batch(k), minutes_ago_batch(k))
     )
 
+    delivery_time_rows.append((dashboard_id, f"{delivery} minutes", SEED_NOW))
+    stability_time_rows.append((dashboard_id, f"{stability} minutes", SEED_NOW))
+
     # -----------------------------
     # Notifications (presentation-ready)
     # -----------------------------
@@ -1023,15 +1199,11 @@ def create_order(
         insert_notification(order_id, "success", "Order was created.", 45)
 
     # Report
-    cur.execute(
-        """
-        INSERT INTO Report (report_id, order_id, report_type, report_content)
-        VALUES (%s,%s,%s,%s)
-        """,
+    report_rows.append(
         (
-            gen_uuid(), order_id, "auto",
+            order_id, "auto",
             f"scenario={scenario}, delivery={delivery}min, stability={stability}min",
-        ),
+        )
     )
 
     # Delivery events (only for some statuses)
@@ -1039,42 +1211,30 @@ def create_order(
 
         base_lat, base_lon = random_coords()
 
-        cur.execute(
-            """
-            INSERT INTO delivery_event (
-                event_id, order_id, event_status, event_message, duration,
-                remaining_stability, condition, lat, lon, eta, recorded_at
-            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        delivery_event_rows.append(
             (
-                gen_uuid(), order_id, "Start",
-                "Driver departed", timedelta(minutes=0),
-                timedelta(minutes=stability), "Normal",
+                order_id, "Start",
+                "Driver departed", "0 minutes",
+                f"{stability} minutes", "Normal",
                 base_lat, base_lon,
                 created_at + timedelta(minutes=max(delivery - 20, 5)),
                 created_at,
-            ),
+            )
         )
 
         mid_time = created_at + timedelta(minutes=max(delivery // 2, 10))
-        cur.execute(
-            """
-            INSERT INTO delivery_event (
-                event_id, order_id, event_status, event_message, duration,
-                remaining_stability, condition, lat, lon, eta, recorded_at
-            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        delivery_event_rows.append(
             (
-                gen_uuid(), order_id, "in Route",
+                order_id, "in Route",
                 "Driver on the way",
-                timedelta(minutes=max(delivery // 2, 10)),
-                timedelta(minutes=max(stability - (delivery // 2), 0)),
+                f"{max(delivery // 2, 10)} minutes",
+                f"{max(stability - (delivery // 2), 0)} minutes",
                 "Normal",
                 base_lat + random.uniform(-0.01, 0.01),
                 base_lon + random.uniform(-0.01, 0.01),
                 created_at + timedelta(minutes=max(delivery - 5, 3)),
                 mid_time,
-            ),
+            )
         )
 
         final_time = delivered_at or (created_at + timedelta(minutes=delivery))
@@ -1085,22 +1245,16 @@ def create_order(
         else:
             e_status, e_msg, e_cond = "on Route", "Driver on route", "Normal"
 
-        cur.execute(
-            """
-            INSERT INTO delivery_event (
-                event_id, order_id, event_status, event_message, duration,
-                remaining_stability, condition, lat, lon, eta, recorded_at
-            ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """,
+        delivery_event_rows.append(
             (
-                gen_uuid(), order_id, e_status, e_msg,
-                timedelta(minutes=delivery),
-                timedelta(minutes=max(stability - delivery, 0)),
+                order_id, e_status, e_msg,
+                f"{delivery} minutes",
+                f"{max(stability - delivery, 0)} minutes",
                 e_cond,
                 base_lat + random.uniform(-0.02, 0.02),
                 base_lon + random.uniform(-0.02, 0.02),
                 final_time, final_time,
-            ),
+            )
         )
 
     return order_id
@@ -1197,19 +1351,19 @@ for idx, s in enumerate(history_statuses):
 # 9) Requests + staging/production (kept)
 # ==========================================================
 
+# Requests reference the orders, so write the buffered order tables first.
+flush_all()
+
 print("📝 Generating a few Requests...")
 
 REQ_STATUSES = ["pending", "approved", "rejected", "resolved"]
-for order_id, meta in list(orders_meta.items())[:6]:
+for order_id, meta in islice(orders_meta.items(), 6):
     if random.random() < 0.5:
         req_status = random.choice(REQ_STATUSES)
         content = f"Request '{req_status}' for order {order_id}"
-        cur.execute(
-            """
-            INSERT INTO Requests (request_id, hospital_id, order_id, status, request_content)
-            VALUES (%s,%s,%s,%s,%s)
-            """,
-            (gen_uuid(), meta["hospital_id"], order_id, req_status, content),
+        execute_prepared(
+            "ins_request",
+            (meta["hospital_id"], order_id, req_status, content),
         )
 
 cur.execute(
@@ -1217,7 +1371,7 @@ cur.execute(
     INSERT INTO staging_incoming_data (data, status)
     VALUES (%s,%s)
     """,
-    (json.dumps({"sample": "staging_payload", "ts": datetime.now().isoformat()}), "pending"),
+    (json.dumps({"sample": "staging_payload", "ts": NOW_ISO}), "pending"),
 )
 
 cur.execute(
@@ -1225,13 +1379,14 @@ cur.execute(
     INSERT INTO production_table (data)
     VALUES (%s)
     """,
-    (json.dumps({"sample": "production_record", "ts": datetime.now().isoformat()}),),
+    (json.dumps({"sample": "production_record", "ts": NOW_ISO}),),
 )
 
 # ==========================================================
 # 10) COMMIT + PRINT OTP LIST
 # ==========================================================
 
+flush_all()
 conn.commit()
 
 print("\n=====================================")
@@ -126,6 +126,9 @@ CREATE TABLE Prescription (
     created_at        TIMESTAMP DEFAULT NOW()   -- prescription creation date
 );
 
+-- patient prescription lists: WHERE patient_id = ?
+CREATE INDEX idx_prescription_patient ON Prescription(patient_id);
+
 -- =============================================================================
 -- 📊 DASHBOARD
 -- =============================================================================
@@ -145,7 +148,8 @@ CREATE TABLE GPS (
     recorded_at  TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX idx_gps_dash ON GPS(dashboard_id);
+-- latest-point lookups: WHERE dashboard_id = ? ORDER BY recorded_at DESC LIMIT 1
+CREATE INDEX idx_gps_dash_recorded ON GPS(dashboard_id, recorded_at DESC);
 
 CREATE TABLE Temperature (
     temperature_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -196,6 +200,9 @@ CREATE TABLE "Order" (
     delivered_at    TIMESTAMP
 );
 
+-- patient order lists / "best order" pick: WHERE patient_id = ? ORDER BY created_at DESC
+CREATE INDEX idx_order_patient_created ON "Order"(patient_id, created_at DESC);
+
 -- =============================================================================
 -- 🔔 NOTIFICATION
 -- =============================================================================
@@ -207,6 +214,9 @@ CREATE TABLE Notification (
     notification_time    TIMESTAMP DEFAULT NOW()
 );
 
+-- per-order notification feeds, newest first
+CREATE INDEX idx_notification_order_time ON Notification(order_id, notification_time DESC);
+
 -- =============================================================================
 -- 📝 REPORT
 -- =============================================================================
@@ -265,3 +275,7 @@ CREATE TABLE delivery_event (
 
     recorded_at         TIMESTAMP DEFAULT NOW()
 );
+
+-- order timelines / reports / dedupe checks: WHERE order_id = ? ORDER BY recorded_at
+-- (ascending report scans walk this index backwards)
+CREATE INDEX idx_delivery_event_order_recorded ON delivery_event(order_id, recorded_at DESC);
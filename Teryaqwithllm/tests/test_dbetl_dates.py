@@ -0,0 +1,30 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "etl"))
+
+pd = pytest.importorskip("pandas")
+dbETL = pytest.importorskip("dbETL")
+
+
+def test_int64_dob_column_is_not_read_as_epoch():
+    col = pd.Series([19900512, 1990], dtype="int64")
+    out = dbETL.normalize_date_series(col)
+    assert list(out) == [date(1990, 5, 12), date(1990, 1, 1)]
+    assert list(out) == [dbETL.normalize_date(v) for v in col]
+
+
+def test_string_dob_column_matches_per_row_parser():
+    col = pd.Series(["1990-05-12", "", "1447-07-15"], dtype=object)
+    out = dbETL.normalize_date_series(col)
+    assert list(out) == [dbETL.normalize_date(v) for v in col]
+
+
+def test_mixed_day_month_column_does_not_depend_on_row_order():
+    col = pd.Series(["13/05/1990", "05/12/1990", "1990-05-12"], dtype=object)
+    out = dbETL.normalize_date_series(col)
+    assert list(out) == [dbETL.normalize_date(v) for v in col]
+    assert list(dbETL.normalize_date_series(col[::-1])) == list(out)[::-1]